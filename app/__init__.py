@@ -5,8 +5,14 @@ from pathlib import Path
 
 from flask import Flask
 
+from .assets import build_assets_command, init_assets
+from .compression import compress_static_command, init_compression
 from .config import Config
+from .database import configure_database, install_pragmas
 from .extensions import csrf, db, migrate
+from .metrics import init_metrics
+from .profiling import init_profiling
+from .query_debug import init_query_debug
 
 
 def create_app(config_class: type[Config] | None = None) -> Flask:
@@ -34,9 +40,19 @@ def _load_instance_config(app: Flask) -> None:
 
 
 def _register_extensions(app: Flask) -> None:
+    configure_database(app)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_pragmas(app, engine)
     migrate.init_app(app, db)
     csrf.init_app(app)
+    # Before init_metrics: after_request hooks run in reverse, so metrics see uncompressed sizes.
+    init_compression(app)
+    init_assets(app)
+    init_metrics(app)
+    init_query_debug(app)
+    init_profiling(app)
 
 
 def _register_blueprints(app: Flask) -> None:
@@ -46,6 +62,10 @@ def _register_blueprints(app: Flask) -> None:
 
 
 def _register_cli(app: Flask) -> None:
-    from .risk.cli import import_sample_data
+    from .risk.cli import import_sample_data, rebuild_search_index, risk_cli
 
     app.cli.add_command(import_sample_data)
+    app.cli.add_command(rebuild_search_index)
+    app.cli.add_command(risk_cli)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(compress_static_command)
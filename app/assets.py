@@ -0,0 +1,119 @@
+"""Fingerprinted, minified static assets.
+
+``flask build-assets`` minifies the JavaScript and CSS under ``app/static/``
+(with ``rjsmin``/``rcssmin`` when installed) and copies every static file to
+``app/static/build/`` with a content hash in its name, for example
+``build/js/main.1f3a9c0d2b7e.js``. ``build/manifest.json`` maps each source path
+to its hashed path.
+
+Templates link assets with ``{{ asset_url('js/main.js') }}``, which resolves
+through the manifest. It falls back to the plain static URL in debug mode or
+when no build exists. A hashed URL always names the same bytes, so those files
+are served with ``Cache-Control: public, max-age=31536000, immutable``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from pathlib import Path, PurePosixPath
+
+import click
+from flask import Flask, Response, current_app, request, url_for
+from flask.cli import with_appcontext
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # pragma: no cover - files are fingerprinted unminified
+    rcssmin = rjsmin = None
+
+BUILD_DIR = "build"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Precompressed variants written by ``flask compress-static``.
+_SKIPPED_SUFFIXES = {".br", ".gz"}
+
+
+def init_assets(app: Flask) -> None:
+    """Register ``asset_url`` for templates and long-lived caching of hashed files."""
+    app.add_template_global(asset_url)
+    app.after_request(_cache_hashed_assets)
+
+
+def asset_url(filename: str) -> str:
+    """URL of static ``filename``, fingerprinted when a build manifest is in use."""
+    return url_for("static", filename=_manifest(current_app).get(filename, filename))
+
+
+def build_assets(static_folder: Path) -> dict[str, str]:
+    """Replace ``static_folder/build`` with minified, hashed copies and their manifest."""
+    build = static_folder / BUILD_DIR
+    shutil.rmtree(build, ignore_errors=True)
+
+    manifest = {}
+    for source in sorted(static_folder.rglob("*")):
+        if not source.is_file() or build in source.parents or source.suffix in _SKIPPED_SUFFIXES:
+            continue
+        name = PurePosixPath(source.relative_to(static_folder).as_posix())
+        data = _minify(source)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = PurePosixPath(BUILD_DIR) / name.with_name(f"{name.stem}.{digest}{name.suffix}")
+        target = static_folder / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        manifest[str(name)] = str(hashed)
+
+    (build / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+@click.command("build-assets")
+@with_appcontext
+def build_assets_command() -> None:
+    """Minify and fingerprint static assets and write the manifest."""
+    manifest = build_assets(Path(current_app.static_folder))
+    if rjsmin is None:
+        click.secho("rjsmin/rcssmin are not installed; assets were fingerprinted unminified.", fg="yellow")
+    click.secho(f"Built {len(manifest)} assets into {BUILD_DIR}/.", fg="green")
+
+
+def _minify(source: Path) -> bytes:
+    data = source.read_bytes()
+    if source.suffix == ".js" and rjsmin is not None:
+        return rjsmin.jsmin(data.decode("utf-8")).encode("utf-8")
+    if source.suffix == ".css" and rcssmin is not None:
+        return rcssmin.cssmin(data.decode("utf-8")).encode("utf-8")
+    return data
+
+
+def _fingerprinting(app: Flask) -> bool:
+    setting = app.config.get("ASSETS_FINGERPRINT")
+    return not app.debug if setting is None else bool(setting)
+
+
+def _manifest(app: Flask) -> dict[str, str]:
+    if not _fingerprinting(app):
+        return {}
+    path = Path(app.static_folder) / BUILD_DIR / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return {}
+    # Reloaded when a new build replaces the file under a running server.
+    cached = app.extensions.get("assets_manifest")
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, json.loads(path.read_text(encoding="utf-8")))
+        app.extensions["assets_manifest"] = cached
+    return cached[1]
+
+
+def _cache_hashed_assets(response: Response) -> Response:
+    filename = (request.view_args or {}).get("filename", "") if request.endpoint == "static" else ""
+    if filename.startswith(f"{BUILD_DIR}/") and filename != f"{BUILD_DIR}/{MANIFEST_NAME}" and response.status_code in (200, 304):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
@@ -0,0 +1,178 @@
+"""Response compression negotiated through ``Accept-Encoding``.
+
+JSON responses of at least ``COMPRESS_MIN_SIZE`` bytes are compressed with
+brotli when the client accepts it and the ``brotli`` package is installed, and
+with gzip otherwise. Streamed responses are compressed chunk by chunk as they
+are sent. Compressing changes the bytes, so a strong ``ETag`` is sent as weak.
+
+Static files are not compressed per request. ``flask compress-static`` writes
+``.gz`` and ``.br`` siblings of the text assets under ``app/static/`` at deploy
+time, and the static view serves the best variant the client accepts, falling
+back to the plain file when a variant is missing or older than its source.
+"""
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import click
+from flask import Flask, Response, current_app, request, send_from_directory
+from flask.cli import with_appcontext
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+STATIC_EXTENSIONS = {".css", ".js", ".json", ".map", ".svg", ".txt", ".html"}
+STATIC_MIN_SIZE = 256
+
+# Encoding name -> file suffix of the precompressed variant.
+_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def init_compression(app: Flask) -> None:
+    """Register the compression hook and the precompressed static view."""
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    app.after_request(_compress_response)
+    if app.has_static_folder:
+        app.view_functions["static"] = send_static_file
+
+
+def available_encodings() -> list[str]:
+    """Encodings this process can produce, preferred first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(offered: Iterable[str] | None = None) -> str | None:
+    """The best of ``offered`` (default: every available encoding) the request accepts."""
+    return request.accept_encodings.best_match(list(offered or available_encodings()))
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    config = current_app.config
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"])
+
+
+def send_static_file(filename: str) -> Response:
+    """Serve ``filename`` from the static folder, preferring a precompressed variant."""
+    app = current_app
+    path = safe_join(app.static_folder, filename)
+    if path is None or Path(path).suffix not in STATIC_EXTENSIONS or not Path(path).is_file():
+        return app.send_static_file(filename)
+
+    # A variant already on disk can be served even without the brotli package.
+    variants = [encoding for encoding, suffix in _SUFFIXES.items() if _is_fresh(Path(path), Path(path + suffix))]
+    if not variants:
+        return app.send_static_file(filename)
+
+    encoding = negotiate_encoding(variants)
+    if encoding is None:
+        response = app.send_static_file(filename)
+    else:
+        response = send_from_directory(
+            app.static_folder,
+            filename + _SUFFIXES[encoding],
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=app.get_send_file_max_age(filename),
+        )
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def compress_static(static_folder: Path, min_size: int = STATIC_MIN_SIZE) -> list[Path]:
+    """Write maximum-ratio ``.gz`` (and ``.br``) variants of the static text assets.
+
+    Files smaller than ``min_size`` and variants newer than their source are
+    skipped. Returns the variants written.
+    """
+    written = []
+    for source in sorted(static_folder.rglob("*")):
+        if not source.is_file() or source.suffix not in STATIC_EXTENSIONS:
+            continue
+        if source.stat().st_size < min_size:
+            continue
+        data = None
+        for encoding in available_encodings():
+            target = source.with_name(source.name + _SUFFIXES[encoding])
+            if _is_fresh(source, target):
+                continue
+            data = data if data is not None else source.read_bytes()
+            target.write_bytes(
+                brotli.compress(data, quality=11) if encoding == "br" else gzip.compress(data, 9, mtime=0)
+            )
+            written.append(target)
+    return written
+
+
+@click.command("compress-static")
+@with_appcontext
+def compress_static_command() -> None:
+    """Precompress static assets so they are served without per-request compression."""
+    written = compress_static(Path(current_app.static_folder))
+    if brotli is None:
+        click.secho("brotli is not installed; wrote gzip variants only.", fg="yellow")
+    click.secho(f"Wrote {len(written)} compressed static files.", fg="green")
+
+
+def _is_fresh(source: Path, variant: Path) -> bool:
+    return variant.is_file() and variant.stat().st_mtime >= source.stat().st_mtime
+
+
+def _compress_response(response: Response) -> Response:
+    config = current_app.config
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in config["COMPRESS_MIMETYPES"]
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        # The body runs after the request context is gone, so build the compressor now.
+        response.response = _compress_stream(response.iter_encoded(), _compressor(encoding))
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _compressor(encoding: str):
+    config = current_app.config
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=config["COMPRESS_BROTLI_QUALITY"])
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)  # 31: gzip container
+    return compressor.compress, compressor.flush
+
+
+def _compress_stream(chunks: Iterable[bytes], compressor) -> Iterator[bytes]:
+    process, finish = compressor
+    for chunk in chunks:
+        output = process(chunk)
+        if output:
+            yield output
+    yield finish()
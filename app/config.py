@@ -1,15 +1,54 @@
 ﻿"""Configuration objects for RCA Flask app."""
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 
+def _database_url(default: str) -> str:
+    """Read ``DATABASE_URL``, pinning bare PostgreSQL URLs to the psycopg2 driver.
+
+    Render and Heroku hand out ``postgres://`` URLs, which SQLAlchemy rejects, and
+    SQLAlchemy's default driver for ``postgresql://`` differs between releases.
+    """
+    url = os.environ.get("DATABASE_URL") or default
+    scheme, separator, rest = url.partition("://")
+    if scheme in ("postgres", "postgresql"):
+        url = f"postgresql+psycopg2{separator}{rest}"
+    return url
+
+
 class Config:
     SECRET_KEY = "change-me"
-    SQLALCHEMY_DATABASE_URI = "sqlite:///rca.sqlite"
+    SQLALCHEMY_DATABASE_URI = _database_url("sqlite:///rca.sqlite")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # See app/database.py; "production" enables WAL and pooled connections on SQLite.
+    DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE") or "default"
     WTF_CSRF_TIME_LIMIT = None
     RISK_MATRIX_DEFAULT = Path(__file__).resolve().parent / "risk" / "risk_matrix.yml"
+    IMPORT_WORKERS = 2
+    # Prometheus request metrics at /metrics; see app/metrics.py.
+    METRICS_ENABLED = True
+    # Slow-query and N+1 logging (app/query_debug.py); None follows app.debug.
+    SQL_DEBUG = None
+    SLOW_QUERY_THRESHOLD_MS = 100
+    N_PLUS_ONE_THRESHOLD = 10
+    # cProfile requests sent with X-Profile: 1 or ?profile=1 (app/profiling.py).
+    PROFILING_ENABLED = False
+    PROFILE_DIR = None  # defaults to instance/profiles
+    PROFILE_KEEP = 50
+    # Accept-Encoding negotiated gzip/brotli for JSON responses (app/compression.py).
+    COMPRESS_ENABLED = True
+    COMPRESS_MIMETYPES = ("application/json",)
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+    # Link static files through the build manifest (app/assets.py); None: unless app.debug.
+    ASSETS_FINGERPRINT = None
+
+
+class ProductionConfig(Config):
+    DATABASE_PROFILE = "production"
 
 
 class TestingConfig(Config):
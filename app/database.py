@@ -0,0 +1,112 @@
+"""Database engine profiles.
+
+A profile bundles the SQLite pragmas issued on every new DBAPI connection with
+the engine/pool options handed to Flask-SQLAlchemy. ``DATABASE_PROFILE`` picks
+one; ``SQLITE_PRAGMAS`` and ``SQLALCHEMY_ENGINE_OPTIONS`` entries in the config
+override individual values. Server databases (PostgreSQL via ``DATABASE_URL``)
+ignore the profile and always get :data:`SERVER_ENGINE_OPTIONS`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+@dataclass(frozen=True)
+class DatabaseProfile:
+    pragmas: dict[str, Any] = field(default_factory=dict)
+    engine_options: dict[str, Any] = field(default_factory=dict)
+
+
+PROFILES: dict[str, DatabaseProfile] = {
+    "default": DatabaseProfile(),
+    "production": DatabaseProfile(
+        pragmas={
+            # Readers no longer wait on the writer, and commits only fsync at checkpoints.
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            # Wait for the write lock instead of failing with "database is locked".
+            "busy_timeout": 5000,
+            "cache_size": -64_000,  # KiB, per connection
+            "mmap_size": 268_435_456,
+            "temp_store": "MEMORY",
+        },
+        engine_options={
+            # One connection per gunicorn thread plus the import workers.
+            "pool_size": 8,
+            "max_overflow": 4,
+            "pool_timeout": 10,
+            "connect_args": {"check_same_thread": False},
+        },
+    ),
+}
+
+# Per worker process: each gunicorn worker holds up to pool_size + max_overflow
+# connections, so keep workers * 15 under the server's max_connections.
+SERVER_ENGINE_OPTIONS: dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 10,
+    # Hosted databases drop idle connections; test before use and recycle early.
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+# Pool options QueuePool accepts but the single-connection pools used for
+# in-memory SQLite do not.
+_QUEUE_POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+
+def configure_database(app: Flask) -> None:
+    """Resolve the configured profile into engine options and pragmas.
+
+    Must run before ``db.init_app`` so the engine is built with the options.
+    """
+    name = app.config.get("DATABASE_PROFILE", "default")
+    try:
+        profile = PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown DATABASE_PROFILE {name!r}; expected one of {sorted(PROFILES)}") from None
+
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() != "sqlite":
+        engine_options = dict(SERVER_ENGINE_OPTIONS)
+        engine_options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+        app.config["SQLITE_PRAGMAS"] = {}
+        return
+
+    in_memory = url.database in (None, "", ":memory:")
+    engine_options = {
+        key: value
+        for key, value in profile.engine_options.items()
+        if not (in_memory and key in _QUEUE_POOL_OPTIONS)
+    }
+    engine_options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+
+    pragmas = dict(profile.pragmas)
+    pragmas.update(app.config.get("SQLITE_PRAGMAS") or {})
+    if in_memory:
+        pragmas.pop("journal_mode", None)
+    app.config["SQLITE_PRAGMAS"] = pragmas
+
+
+def install_pragmas(app: Flask, engine: Engine) -> None:
+    """Issue the configured pragmas on each connection ``engine`` opens."""
+    pragmas = app.config.get("SQLITE_PRAGMAS") or {}
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,143 @@
+"""Per-endpoint request metrics exposed in Prometheus text format at ``/metrics``.
+
+For every request routed to a view the app records latency, the number of SQL
+statements and the time spent in them (via cursor execute events), and the
+response size, all labelled by endpoint name. Streamed responses are measured
+when the body has been fully sent.
+
+Under gunicorn each worker has its own memory, so ``gunicorn.conf.py`` points
+``PROMETHEUS_MULTIPROC_DIR`` at a shared directory before the workers start;
+``prometheus_client`` then writes samples there and ``/metrics`` aggregates all
+workers. Without that variable the metrics are per process.
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+
+from flask import Flask, Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+LATENCY = Histogram(
+    "rca_request_latency_seconds",
+    "Time from request start until the response body was sent.",
+    ["endpoint", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+SQL_STATEMENTS = Histogram(
+    "rca_request_sql_statements",
+    "SQL statements executed per request.",
+    ["endpoint"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 1000),
+)
+SQL_SECONDS = Histogram(
+    "rca_request_sql_seconds",
+    "Time spent executing SQL per request.",
+    ["endpoint"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+RESPONSE_BYTES = Histogram(
+    "rca_response_size_bytes",
+    "Response body size in bytes, before compression.",
+    ["endpoint"],
+    buckets=(256, 1024, 4096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216),
+)
+
+# Endpoints that would only measure themselves.
+_SKIPPED_ENDPOINTS = {"static", "metrics"}
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    sql_seconds: float = 0.0
+    response_bytes: int = 0
+
+
+def init_metrics(app: Flask) -> None:
+    """Register the request hooks, SQL listeners and the ``/metrics`` view."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    from .extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+def metrics_view() -> Response:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        body = generate_latest(registry)
+    else:
+        body = generate_latest()
+    return Response(body, mimetype=CONTENT_TYPE_LATEST, headers={"Cache-Control": "no-store"})
+
+
+def _start_request() -> None:
+    if request.endpoint not in _SKIPPED_ENDPOINTS:
+        g.request_metrics = RequestMetrics()
+
+
+def _finish_request(response: Response) -> Response:
+    # Left on ``g``: a streamed body still runs queries after this hook returns.
+    metrics: RequestMetrics | None = g.get("request_metrics")
+    if metrics is None:
+        return response
+
+    endpoint = request.endpoint or "unmatched"
+    method, status = request.method, str(response.status_code)
+
+    if response.is_streamed:
+        response.response = _counting(response.iter_encoded(), metrics)
+    else:
+        metrics.response_bytes = response.calculate_content_length() or 0
+
+    def observe() -> None:
+        LATENCY.labels(endpoint, method, status).observe(time.perf_counter() - metrics.started)
+        SQL_STATEMENTS.labels(endpoint).observe(metrics.statements)
+        SQL_SECONDS.labels(endpoint).observe(metrics.sql_seconds)
+        RESPONSE_BYTES.labels(endpoint).observe(metrics.response_bytes)
+
+    response.call_on_close(observe)
+    return response
+
+
+def _counting(chunks, metrics: RequestMetrics):
+    for chunk in chunks:
+        metrics.response_bytes += len(chunk)
+        yield chunk
+
+
+def _current_metrics() -> RequestMetrics | None:
+    return g.get("request_metrics") if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_metrics() is not None:
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics = _current_metrics()
+    starts = conn.info.get("metrics_query_start")
+    if metrics is None or not starts:
+        return
+    metrics.statements += 1
+    metrics.sql_seconds += time.perf_counter() - starts.pop()
@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import TYPE_CHECKING
 
 from sqlalchemy import CheckConstraint, Enum, UniqueConstraint
 from sqlalchemy.sql import func
 
 from .extensions import db
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .risk.matrix import RiskMatrix
+
 
 class TimestampMixin:
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -35,7 +39,9 @@ class MethodStatement(TimestampMixin, db.Model):
     __tablename__ = "method_statements"
 
     id = db.Column(db.Integer, primary_key=True)
-    work_order_id = db.Column(db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), nullable=False)
+    work_order_id = db.Column(
+        db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     title = db.Column(db.String(255), nullable=False)
     source_filename = db.Column(db.String(255))
     version = db.Column(db.String(64))
@@ -116,8 +122,11 @@ class Task(TimestampMixin, db.Model):
     __tablename__ = "tasks"
 
     id = db.Column(db.Integer, primary_key=True)
+    # Lookups by work order use the leading column of ix_tasks_work_order_sequence.
     work_order_id = db.Column(db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), nullable=False)
-    method_statement_id = db.Column(db.Integer, db.ForeignKey("method_statements.id", ondelete="SET NULL"))
+    method_statement_id = db.Column(
+        db.Integer, db.ForeignKey("method_statements.id", ondelete="SET NULL"), index=True
+    )
     sequence = db.Column(db.Integer, default=0)
 
     activity = db.Column(db.String(255), nullable=False)
@@ -153,25 +162,33 @@ class Task(TimestampMixin, db.Model):
         CheckConstraint("severity BETWEEN 1 AND 5", name="ck_task_severity_range"),
         CheckConstraint("residual_likelihood BETWEEN 1 AND 5", name="ck_task_residual_likelihood_range"),
         CheckConstraint("residual_severity BETWEEN 1 AND 5", name="ck_task_residual_severity_range"),
+        db.Index("ix_tasks_work_order_sequence", "work_order_id", "sequence", "id"),
+        db.Index("ix_tasks_work_order_updated_at", "work_order_id", "updated_at"),
     )
 
-    def update_risk(self, categories: list[RiskMatrixCategory], residual: bool = False) -> None:
+    def update_risk(self, matrix: RiskMatrix, residual: bool = False) -> None:
+        """Recompute a score and assign its category from the precomputed matrix.
+
+        Only the foreign key is written; the ``risk_category`` relationships reflect
+        the new band once the session is flushed and the attribute is reloaded.
+        """
         if residual:
             score = (self.residual_likelihood or 1) * (self.residual_severity or 1)
             self.residual_risk_score = score
-            self.residual_risk_category = _match_category(categories, score)
+            self.residual_risk_category_id = matrix.category_id_for(score)
         else:
             score = (self.likelihood or 1) * (self.severity or 1)
             self.risk_score = score
-            self.risk_category = _match_category(categories, score)
+            self.risk_category_id = matrix.category_id_for(score)
 
 
 class TaskHazard(TimestampMixin, db.Model):
     __tablename__ = "task_hazards"
 
     id = db.Column(db.Integer, primary_key=True)
+    # Lookups by task (alone or with hazard) use the uq_task_hazard index.
     task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
-    hazard_id = db.Column(db.Integer, db.ForeignKey("hazards.id", ondelete="CASCADE"), nullable=False)
+    hazard_id = db.Column(db.Integer, db.ForeignKey("hazards.id", ondelete="CASCADE"), nullable=False, index=True)
     parameter_value = db.Column(db.String(120))
     notes = db.Column(db.Text)
     is_primary = db.Column(db.Boolean, default=False)
@@ -180,7 +197,10 @@ class TaskHazard(TimestampMixin, db.Model):
     hazard = db.relationship("Hazard", back_populates="task_links")
     controls = db.relationship("TaskControl", back_populates="task_hazard", cascade="all, delete-orphan")
 
-    __table_args__ = (UniqueConstraint("task_id", "hazard_id", name="uq_task_hazard"),)
+    __table_args__ = (
+        UniqueConstraint("task_id", "hazard_id", name="uq_task_hazard"),
+        db.Index("ix_task_hazards_updated_at", "updated_at"),
+    )
 
 
 class ControlPhase:
@@ -192,9 +212,12 @@ class TaskControl(TimestampMixin, db.Model):
     __tablename__ = "task_controls"
 
     id = db.Column(db.Integer, primary_key=True)
-    task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Lookups by task hazard use the uq_task_hazard_control index.
     task_hazard_id = db.Column(db.Integer, db.ForeignKey("task_hazards.id", ondelete="CASCADE"), nullable=False)
-    control_id = db.Column(db.Integer, db.ForeignKey("control_measures.id", ondelete="CASCADE"), nullable=False)
+    control_id = db.Column(
+        db.Integer, db.ForeignKey("control_measures.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     phase = db.Column(Enum(ControlPhase.EXISTING, ControlPhase.ADDITIONAL, name="control_phase"), nullable=False)
     notes = db.Column(db.Text)
 
@@ -202,12 +225,95 @@ class TaskControl(TimestampMixin, db.Model):
     task_hazard = db.relationship("TaskHazard", back_populates="controls")
     control = db.relationship("ControlMeasure", back_populates="task_links")
 
-    __table_args__ = (UniqueConstraint("task_hazard_id", "control_id", "phase", name="uq_task_hazard_control"),)
+    __table_args__ = (
+        UniqueConstraint("task_hazard_id", "control_id", "phase", name="uq_task_hazard_control"),
+        db.Index("ix_task_controls_updated_at", "updated_at"),
+    )
+
+
+class ImportStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ImportJob(TimestampMixin, db.Model):
+    __tablename__ = "import_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    work_order_id = db.Column(
+        db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    source_filename = db.Column(db.String(255), nullable=False)
+    replace_existing = db.Column(db.Boolean, nullable=False, default=True)
+    status = db.Column(
+        Enum(
+            ImportStatus.QUEUED,
+            ImportStatus.RUNNING,
+            ImportStatus.SUCCEEDED,
+            ImportStatus.FAILED,
+            name="import_status",
+        ),
+        nullable=False,
+        default=ImportStatus.QUEUED,
+    )
+    total_rows = db.Column(db.Integer)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime(timezone=True))
+    finished_at = db.Column(db.DateTime(timezone=True))
+
+    work_order = db.relationship("WorkOrder")
+
+
+class CatalogVersion(db.Model):
+    """Version stamp for a cached catalog, shared by every worker process."""
+
+    __tablename__ = "catalog_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.String(32), nullable=False)
+
+
+class RiskPhase:
+    INITIAL = "initial"
+    RESIDUAL = "residual"
+
+
+class RiskHeatmapCell(db.Model):
+    """Number of a work order's tasks in one likelihood/severity cell of a phase.
+
+    Maintained alongside the tasks by ``app/risk/heatmap.py``.
+    """
 
+    __tablename__ = "risk_heatmap_cells"
 
-def _match_category(categories: list[RiskMatrixCategory], score: int) -> RiskMatrixCategory | None:
-    for category in categories:
-        if category.contains(score):
-            return category
-    return None
+    work_order_id = db.Column(
+        db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+    )
+    phase = db.Column(
+        Enum(RiskPhase.INITIAL, RiskPhase.RESIDUAL, name="risk_phase"), primary_key=True
+    )
+    likelihood = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    severity = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SyncTombstone(db.Model):
+    """Marker left by a deleted task, task hazard or task control.
+
+    Lets ``app/risk/sync.py`` report deletions to clients syncing a work order.
+    """
+
+    __tablename__ = "sync_tombstones"
+
+    id = db.Column(db.Integer, primary_key=True)
+    work_order_id = db.Column(db.Integer, db.ForeignKey("work_orders.id", ondelete="CASCADE"), nullable=False)
+    # The task, or the task a deleted link belonged to; no foreign key, it may be gone.
+    task_id = db.Column(db.Integer, nullable=False)
+    record_type = db.Column(db.String(32), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (db.Index("ix_sync_tombstones_work_order_deleted_at", "work_order_id", "deleted_at"),)
@@ -0,0 +1,159 @@
+"""On-demand cProfile captures of single requests.
+
+With ``PROFILING_ENABLED`` set, a request carrying an ``X-Profile: 1`` header or
+a ``?profile=1`` query flag runs under cProfile, body included, and its stats are
+written to ``PROFILE_DIR`` (``instance/profiles/`` by default) as a ``.prof``
+pstats file. Open it with ``snakeviz <file>`` for an icicle/flame view, or load
+it with :mod:`pstats`. A JSON sidecar records the route, status and duration,
+``GET /profiles`` lists recent captures and the response names its capture in
+an ``X-Profile-Id`` header.
+
+Work a profiled request hands to a background thread (method statement imports)
+is captured as a separate profile; see :func:`profiled`.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from flask import Flask, abort, current_app, has_request_context, jsonify, request, send_from_directory, url_for
+from werkzeug.exceptions import HTTPException
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_QUERY_ARG = "profile"
+
+_ENVIRON_KEY = "rca.profile_id"
+_TRUTHY = {"1", "true", "yes", "on"}
+_INDEX_LIMIT = 50
+
+
+def init_profiling(app: Flask) -> None:
+    """Wrap the WSGI app with the profiler and register the index views."""
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+    app.wsgi_app = _ProfilerMiddleware(app.wsgi_app, app)
+    app.add_url_rule("/profiles", "profiles", profiles_index)
+    app.add_url_rule("/profiles/<profile_id>.prof", "profile_download", profile_download)
+
+
+def profile_dir(app: Flask) -> Path:
+    return Path(app.config.get("PROFILE_DIR") or Path(app.instance_path) / "profiles")
+
+
+def profiling_requested() -> bool:
+    """Whether the request being handled is itself being profiled."""
+    return has_request_context() and _ENVIRON_KEY in request.environ
+
+
+@contextmanager
+def profiled(app: Flask, route: str, method: str, path: str, profile_id: str | None = None) -> Iterator[dict]:
+    """Run the enclosed block under cProfile and save the capture when it exits.
+
+    Yields the metadata dict written next to the stats, so callers can record
+    fields (such as ``status``) that are only known once the work is done.
+    """
+    started_at = datetime.now(timezone.utc)
+    meta = {
+        "id": profile_id or _new_profile_id(started_at),
+        "route": route,
+        "method": method,
+        "path": path,
+        "status": None,
+        "started_at": started_at.isoformat(),
+    }
+    profiler = cProfile.Profile()
+    started = perf_counter()
+    profiler.enable()
+    try:
+        yield meta
+    finally:
+        profiler.disable()
+        meta["duration_ms"] = round((perf_counter() - started) * 1000, 1)
+        _save(app, profiler, meta)
+
+
+def profiles_index():
+    """Most recent captures first, with their route and duration."""
+    limit = min(request.args.get("limit", _INDEX_LIMIT, type=int) or _INDEX_LIMIT, _INDEX_LIMIT)
+    profiles = []
+    for meta_path in sorted(profile_dir(current_app).glob("*.json"), reverse=True)[:limit]:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["download"] = url_for("profile_download", profile_id=meta["id"])
+        profiles.append(meta)
+    return jsonify({"profiles": profiles})
+
+
+def profile_download(profile_id: str):
+    directory = profile_dir(current_app)
+    if not (directory / f"{profile_id}.prof").is_file():
+        abort(404, description="Profile not found")
+    return send_from_directory(directory, f"{profile_id}.prof", as_attachment=True)
+
+
+class _ProfilerMiddleware:
+    def __init__(self, wsgi_app, app: Flask):
+        self.wsgi_app = wsgi_app
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        if not _wants_profile(environ) or environ.get("PATH_INFO", "").startswith("/profiles"):
+            return self.wsgi_app(environ, start_response)
+
+        profile_id = _new_profile_id(datetime.now(timezone.utc))
+        environ[_ENVIRON_KEY] = profile_id
+        path = environ.get("PATH_INFO", "")
+        route = self._route(environ) or path
+
+        with profiled(self.app, route, environ.get("REQUEST_METHOD", "GET"), path, profile_id) as meta:
+
+            def capture_status(status, headers, exc_info=None):
+                meta["status"] = int(status.split(" ", 1)[0])
+                headers.append(("X-Profile-Id", profile_id))
+                return start_response(status, headers, exc_info)
+
+            # Drain the body inside the capture so streamed responses are included.
+            app_iter = self.wsgi_app(environ, capture_status)
+            try:
+                body = list(app_iter)
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+        return body
+
+    def _route(self, environ) -> str | None:
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            return None
+        return rule.rule
+
+
+def _wants_profile(environ) -> bool:
+    if environ.get(PROFILE_HEADER, "").lower() in _TRUTHY:
+        return True
+    values = parse_qs(environ.get("QUERY_STRING", "")).get(PROFILE_QUERY_ARG, [])
+    return any(value.lower() in _TRUTHY for value in values)
+
+
+def _new_profile_id(started_at: datetime) -> str:
+    # Sorts chronologically, which the index and pruning rely on.
+    return f"{started_at:%Y%m%dT%H%M%S%f}-{uuid4().hex[:6]}"
+
+
+def _save(app: Flask, profiler: cProfile.Profile, meta: dict) -> None:
+    directory = profile_dir(app)
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{meta['id']}.prof")
+    (directory / f"{meta['id']}.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    keep = app.config.get("PROFILE_KEEP", _INDEX_LIMIT)
+    for stale in sorted(directory.glob("*.json"), reverse=True)[keep:]:
+        stale.with_suffix(".prof").unlink(missing_ok=True)
+        stale.unlink(missing_ok=True)
@@ -0,0 +1,127 @@
+"""Development-time SQL diagnostics: slow statements and N+1 query patterns.
+
+Active when ``SQL_DEBUG`` is true, or when it is unset and the app runs in debug
+mode. For each request the hooks time every statement and group statements by
+shape (the SQL text with ``IN (?, ?, ...)`` lists collapsed), then:
+
+* log any statement slower than ``SLOW_QUERY_THRESHOLD_MS`` with its parameters
+  and the route that issued it;
+* log each shape executed more than ``N_PLUS_ONE_THRESHOLD`` times, the
+  signature of a lazy load inside a loop;
+* add ``X-SQL-Summary``, ``X-SQL-Repeated`` and ``Server-Timing`` headers so the
+  numbers show up in the browser's network panel.
+
+Headers of a streamed response go out before its body runs, so they only cover
+the queries issued up to that point; the log lines cover everything.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_SELECT_LIST = re.compile(r"^SELECT .+? FROM ", re.IGNORECASE)
+
+_MAX_LOGGED_PARAMETERS = 500
+_MAX_HEADER_STATEMENT = 160
+
+
+@dataclass
+class QueryLog:
+    statements: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+
+def init_query_debug(app: Flask) -> None:
+    """Register the statement timers and the per-request summary hooks."""
+    from .extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise ``statement`` so executions differing only in IN-list length match."""
+    return _PLACEHOLDER_LIST.sub("(?...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _enabled(app: Flask) -> bool:
+    setting = app.config.get("SQL_DEBUG")
+    return app.debug if setting is None else bool(setting)
+
+
+def _start_request() -> None:
+    if _enabled(current_app) and request.endpoint != "static":
+        g.query_log = QueryLog()
+
+
+def _finish_request(response: Response) -> Response:
+    log: QueryLog | None = g.get("query_log")
+    if log is None:
+        return response
+
+    threshold = current_app.config["N_PLUS_ONE_THRESHOLD"]
+    repeated = [(shape, count) for shape, count in log.shapes.most_common() if count > threshold]
+    for shape, count in repeated:
+        current_app.logger.warning(
+            "Possible N+1: %d executions of one statement in %s %s (%s): %s",
+            count, request.method, request.path, request.endpoint, shape,
+        )
+
+    milliseconds = log.seconds * 1000
+    response.headers["X-SQL-Summary"] = (
+        f"queries={log.statements}; time_ms={milliseconds:.1f}; slow={log.slow}; repeated={len(repeated)}"
+    )
+    if repeated:
+        shape, count = repeated[0]
+        # The column list is noise in a header; FROM/WHERE identify the relationship.
+        abbreviated = _SELECT_LIST.sub("SELECT ... FROM ", shape, count=1)
+        response.headers["X-SQL-Repeated"] = _header_safe(f"{count}x {abbreviated}")[:_MAX_HEADER_STATEMENT]
+    response.headers.add("Server-Timing", f'sql;dur={milliseconds:.1f};desc="{log.statements} queries"')
+    return response
+
+
+def _header_safe(text: str) -> str:
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def _current_log() -> QueryLog | None:
+    return g.get("query_log") if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_log() is not None:
+        conn.info.setdefault("query_debug_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    log = _current_log()
+    starts = conn.info.get("query_debug_start")
+    if log is None or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    log.statements += 1
+    log.seconds += elapsed
+    log.shapes[statement_shape(statement)] += 1
+
+    if elapsed * 1000 >= current_app.config["SLOW_QUERY_THRESHOLD_MS"]:
+        log.slow += 1
+        current_app.logger.warning(
+            "Slow query (%.1f ms) in %s %s (%s): %s\nParameters: %.*s",
+            elapsed * 1000, request.method, request.path, request.endpoint,
+            _WHITESPACE.sub(" ", statement), _MAX_LOGGED_PARAMETERS, repr(parameters),
+        )
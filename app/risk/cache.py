@@ -0,0 +1,138 @@
+"""Process-level caches for slowly changing catalog data.
+
+Every cached dataset belongs to a named catalog whose version stamp lives in the
+``catalog_versions`` table. ORM writes to a tracked model replace the stamp in the
+same transaction, so each gunicorn worker notices the change on its next read and
+rebuilds its own copy. Writes that bypass the unit of work (bulk ``UPDATE``s,
+Core inserts) must call :func:`bump_catalog_version` themselves.
+"""
+from __future__ import annotations
+
+import hashlib
+from itertools import chain
+from typing import Any, Callable, Sequence, TypeVar
+from uuid import uuid4
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import CatalogVersion, ControlMeasure, Hazard, PersonnelAtRisk, RiskMatrixCategory, WorkOrder
+
+T = TypeVar("T")
+
+RISK_MATRIX = "risk_matrix"
+HAZARDS = "hazards"
+CONTROLS = "controls"
+PERSONNEL = "personnel"
+WORK_ORDERS = "work_orders"
+
+TRACKED_MODELS: dict[type, str] = {
+    RiskMatrixCategory: RISK_MATRIX,
+    Hazard: HAZARDS,
+    ControlMeasure: CONTROLS,
+    PersonnelAtRisk: PERSONNEL,
+    WorkOrder: WORK_ORDERS,
+}
+
+_SESSION_VERSIONS_KEY = "catalog_versions"
+
+_entries: dict[tuple[tuple[str, ...], str | None], tuple[str | None, Any]] = {}
+
+
+def catalog_version(name: str) -> str | None:
+    """Return the current stamp for ``name``, read at most once per transaction."""
+    return catalog_versions((name,))[name]
+
+
+def catalog_versions(names: Sequence[str]) -> dict[str, str | None]:
+    """Return the stamps for ``names``, fetching any not yet seen in one query."""
+    versions = db.session.info.setdefault(_SESSION_VERSIONS_KEY, {})
+    missing = [name for name in names if name not in versions]
+    if missing:
+        table = CatalogVersion.__table__
+        with db.session.no_autoflush:
+            rows = db.session.execute(
+                select(table.c.name, table.c.version).where(table.c.name.in_(missing))
+            ).all()
+        found = dict(rows)
+        for name in missing:
+            versions[name] = found.get(name)
+    return {name: versions[name] for name in names}
+
+
+def combined_version(names: str | Sequence[str]) -> str | None:
+    """Single stamp for one or more catalogs that moves whenever any of them does."""
+    names = _as_names(names)
+    versions = catalog_versions(names)
+    if len(names) == 1:
+        return versions[names[0]]
+    joined = "|".join(f"{name}={versions[name]}" for name in names)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:32]
+
+
+def get_or_build(names: str | Sequence[str], builder: Callable[[], T], key: str | None = None) -> T:
+    """Return the cached value for ``names``, calling ``builder`` when a stamp moved.
+
+    ``key`` lets one catalog hold several derived values (e.g. the lookup object
+    and its serialized JSON), all invalidated by the same stamp.
+    """
+    names = _as_names(names)
+    version = combined_version(names)
+    entry = _entries.get((names, key))
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    value = builder()
+    _entries[(names, key)] = (version, value)
+    return value
+
+
+def catalog_etag(names: str | Sequence[str]) -> str:
+    """Entity tag for responses built solely from the given catalogs."""
+    names = _as_names(names)
+    label = names[0] if len(names) == 1 else "catalogs"
+    return f"{label}-{combined_version(names) or 'initial'}"
+
+
+def bump_catalog_version(name: str, session: Session | None = None) -> str:
+    """Give ``name`` a fresh stamp inside the current transaction."""
+    session = session or db.session
+    token = uuid4().hex
+    table = CatalogVersion.__table__
+    connection = session.connection()
+    result = connection.execute(update(table).where(table.c.name == name).values(version=token))
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(name=name, version=token))
+    session.info.setdefault(_SESSION_VERSIONS_KEY, {})[name] = token
+    return token
+
+
+def _as_names(names: str | Sequence[str]) -> tuple[str, ...]:
+    return (names,) if isinstance(names, str) else tuple(names)
+
+
+def clear() -> None:
+    """Drop every cached value held by this process."""
+    _entries.clear()
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_changed_catalogs(session: Session, flush_context, instances) -> None:
+    changed = {
+        TRACKED_MODELS[type(obj)]
+        for obj in chain(session.new, session.deleted)
+        if type(obj) in TRACKED_MODELS
+    }
+    changed.update(
+        TRACKED_MODELS[type(obj)]
+        for obj in session.dirty
+        if type(obj) in TRACKED_MODELS and session.is_modified(obj, include_collections=False)
+    )
+    for name in sorted(changed):
+        bump_catalog_version(name, session)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_session_versions(session: Session) -> None:
+    session.info.pop(_SESSION_VERSIONS_KEY, None)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import click
-from flask.cli import with_appcontext
+from flask.cli import AppGroup, with_appcontext
 
 
 @click.command("import-sample-data")
@@ -13,3 +13,91 @@ def import_sample_data() -> None:
 
     services.bootstrap_seed_data()
     click.secho("Sample risk data imported.", fg="green")
+
+
+@click.command("rebuild-search-index")
+@with_appcontext
+def rebuild_search_index() -> None:
+    """Recreate the hazard and control full-text search indexes."""
+    from . import search
+
+    if not search.rebuild_search_indexes():
+        click.secho("Search indexes are SQLite-only; this database searches the catalogs directly.", fg="yellow")
+        return
+    click.secho("Search indexes rebuilt.", fg="green")
+
+
+risk_cli = AppGroup("risk", help="Risk assessment data tools.")
+
+
+@risk_cli.command("generate")
+@click.option("--work-orders", type=click.IntRange(min=1), default=100, show_default=True)
+@click.option("--tasks-per-wo", type=click.IntRange(min=1), default=50, show_default=True)
+@click.option("--hazards-per-task", type=click.IntRange(min=1), default=2, show_default=True,
+              help="Average hazards per task; each task gets one fewer to one more.")
+@click.option("--catalog-size", type=click.IntRange(min=1), default=200, show_default=True,
+              help="Grow the hazard and control catalogs to at least this many entries.")
+@click.option("--seed", type=int, default=1, show_default=True)
+@click.option("--prefix", default="GEN", show_default=True, help="Work order number prefix.")
+def generate(
+    work_orders: int, tasks_per_wo: int, hazards_per_task: int, catalog_size: int, seed: int, prefix: str
+) -> None:
+    """Bulk-insert a deterministic synthetic dataset for benchmarks and load tests."""
+    import time
+
+    from . import services
+    from .generate import generate_dataset
+
+    started = time.perf_counter()
+    try:
+        summary = generate_dataset(
+            work_orders,
+            tasks_per_wo,
+            hazards_per_task,
+            catalog_size,
+            services.load_risk_matrix(),
+            seed=seed,
+            prefix=prefix,
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.secho(
+        f"Generated {summary.work_orders} work orders, {summary.tasks} tasks, "
+        f"{summary.task_hazards} hazard links and {summary.task_controls} control links "
+        f"(+{summary.hazards_added} hazards, +{summary.controls_added} controls) "
+        f"in {time.perf_counter() - started:.1f}s.",
+        fg="green",
+    )
+
+
+@risk_cli.command("rebuild-heatmap")
+def rebuild_heatmap() -> None:
+    """Recompute the heatmap cell counts from the tasks table."""
+    from ..extensions import db
+    from .heatmap import rebuild_heatmap as rebuild
+
+    cells = rebuild()
+    db.session.commit()
+    click.secho(f"Heatmap rebuilt: {cells} cells.", fg="green")
+
+
+@risk_cli.command("rescore")
+@click.option("--from-yaml", is_flag=True,
+              help="First update the bands from the risk matrix file (RISK_MATRIX_DEFAULT), matching on label.")
+def rescore(from_yaml: bool) -> None:
+    """Reassign every task's initial and residual risk category from the current bands."""
+    import time
+
+    from ..extensions import db
+    from . import cache, rescoring, services
+
+    started = time.perf_counter()
+    if from_yaml:
+        click.echo(f"Risk bands updated from file: {services.sync_risk_categories()} changed.")
+        db.session.flush()
+    rescored = db.session.info.pop(rescoring.RESCORED_KEY, 0)
+    rescored += rescoring.rescore_tasks(rescoring.current_matrix())
+    # Bands edited outside the ORM never moved the stamp; make every worker reload them.
+    cache.bump_catalog_version(cache.RISK_MATRIX)
+    db.session.commit()
+    click.secho(f"Rescored {rescored} task risk categories in {time.perf_counter() - started:.1f}s.", fg="green")
@@ -0,0 +1,303 @@
+"""Deterministic synthetic datasets for benchmarks and load tests.
+
+Everything is written with executemany ``INSERT``s in batches of work orders, so
+tens of thousands of tasks take seconds rather than minutes. The same seed on the
+same starting database always produces the same rows.
+
+Catalog usage is skewed the way real method statements are: hazard popularity
+follows a Zipf-like curve over a seeded ordering of the catalog, and each hazard
+draws its controls from a short list of preferred controls that is itself skewed.
+"""
+from __future__ import annotations
+
+import random
+from bisect import bisect
+from dataclasses import dataclass
+from itertools import accumulate, count
+
+from sqlalchemy import func, insert, select
+
+from ..extensions import db
+from ..models import (
+    ControlMeasure,
+    ControlPhase,
+    Hazard,
+    MethodStatement,
+    PersonnelAtRisk,
+    Task,
+    TaskControl,
+    TaskHazard,
+    WorkOrder,
+)
+from . import cache, heatmap
+from .matrix import RiskMatrix
+
+# Zipf exponent for hazard and control popularity; ~1 matches the long tail seen in
+# real assessments, where a handful of hazards appear on most tasks.
+SKEW = 1.1
+PREFERRED_CONTROLS = 8
+WORK_ORDER_BATCH_SIZE = 100
+
+HAZARD_KINDS = [
+    ("Electrical", "Live conductors"),
+    ("Electrical", "Arc flash"),
+    ("Mechanical", "Stored energy release"),
+    ("Mechanical", "Rotating machinery"),
+    ("Mechanical", "Pinch points"),
+    ("Manual Handling", "Heavy lift"),
+    ("Chemical", "Corrosive exposure"),
+    ("Chemical", "Toxic vapour"),
+    ("Work At Height", "Fall from height"),
+    ("Thermal", "Hot surfaces"),
+    ("Pressure", "High pressure steam"),
+    ("Confined Space", "Oxygen deficiency"),
+    ("Environmental", "Noise exposure"),
+    ("Fire", "Ignition sources"),
+]
+CONTROL_KINDS = [
+    ("Electrical Isolation", "Lock-out tag-out"),
+    ("Procedural", "Permit to work"),
+    ("Procedural", "Method statement review"),
+    ("PPE", "Arc-rated clothing"),
+    ("PPE", "Chemical resistant gloves"),
+    ("PPE", "Hearing protection"),
+    ("Handling Equipment", "Mechanical lifting aid"),
+    ("Communication", "Job safety briefing"),
+    ("Supervision", "Spotter assigned"),
+    ("Monitoring", "Gas testing"),
+    ("Engineering", "Barrier guarding"),
+    ("Engineering", "Pressure relief verified"),
+]
+PLANT_AREAS = [
+    "boiler house", "turbine hall", "switchyard", "cooling tower", "coal handling",
+    "water treatment", "transformer bay", "fuel oil farm", "ash plant", "control room",
+]
+ACTIVITIES = [
+    "Isolate and prove dead", "Remove inspection covers", "Inspect and measure wear",
+    "Replace worn components", "Torque and reassemble", "Flush and refill", "Align coupling",
+    "Test run and monitor", "Reinstate guards", "Clean and degrease", "Calibrate instruments",
+]
+DEFAULT_PERSONNEL = ["Maintenance crew", "Operations team", "Technicians", "Contractors", "Specialists"]
+
+
+@dataclass(frozen=True)
+class GenerationSummary:
+    work_orders: int
+    tasks: int
+    task_hazards: int
+    task_controls: int
+    hazards_added: int
+    controls_added: int
+
+
+class _SkewedChoice:
+    """Draw from ``items`` with Zipf-like weights over a seeded ordering."""
+
+    def __init__(self, items: list, rng: random.Random, skew: float = SKEW):
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self._cumulative = list(accumulate(1 / rank**skew for rank in range(1, len(self.items) + 1)))
+
+    def sample(self, rng: random.Random, k: int) -> list:
+        """``k`` distinct items, more popular ones more likely."""
+        k = min(k, len(self.items))
+        chosen: dict = {}
+        total = self._cumulative[-1]
+        while len(chosen) < k:
+            item = self.items[bisect(self._cumulative, rng.random() * total)]
+            chosen.setdefault(item, None)
+        return list(chosen)
+
+
+def generate_dataset(
+    work_orders: int,
+    tasks_per_work_order: int,
+    hazards_per_task: int,
+    catalog_size: int,
+    matrix: RiskMatrix,
+    seed: int = 1,
+    prefix: str = "GEN",
+) -> GenerationSummary:
+    """Add ``work_orders`` work orders of synthetic tasks, growing the catalogs to ``catalog_size``.
+
+    Work orders are numbered ``<prefix>-000001`` upwards; a :class:`ValueError` is
+    raised if any work order with that prefix already exists. Commits once per
+    batch of work orders.
+    """
+    existing = db.session.execute(
+        select(func.count()).select_from(WorkOrder).where(WorkOrder.number.like(f"{prefix}-%"))
+    ).scalar()
+    if existing:
+        raise ValueError(f"{existing} work orders numbered {prefix}-* already exist; choose another prefix.")
+
+    rng = random.Random(seed)
+    hazards_added = _grow_catalog(Hazard, HAZARD_KINDS, catalog_size, rng)
+    controls_added = _grow_catalog(ControlMeasure, CONTROL_KINDS, catalog_size, rng)
+    hazard_rows = db.session.execute(
+        select(Hazard.id, Hazard.name, Hazard.default_likelihood, Hazard.default_severity).order_by(Hazard.id)
+    ).all()
+    control_names = dict(
+        db.session.execute(select(ControlMeasure.id, ControlMeasure.name).order_by(ControlMeasure.id)).all()
+    )
+    personnel = db.session.execute(select(PersonnelAtRisk.name).order_by(PersonnelAtRisk.id)).scalars().all()
+    personnel = personnel or DEFAULT_PERSONNEL
+
+    hazards = {row.id: row for row in hazard_rows}
+    hazard_choice = _SkewedChoice([row.id for row in hazard_rows], rng)
+    control_choice = _SkewedChoice(list(control_names), rng)
+    preferred = {
+        hazard_id: _SkewedChoice(control_choice.sample(rng, PREFERRED_CONTROLS), rng)
+        for hazard_id in hazards
+    }
+
+    numbers = count(1)
+    totals = {"tasks": 0, "task_hazards": 0, "task_controls": 0}
+    for start in range(0, work_orders, WORK_ORDER_BATCH_SIZE):
+        batch = [f"{prefix}-{next(numbers):06d}" for _ in range(min(WORK_ORDER_BATCH_SIZE, work_orders - start))]
+        plans = [
+            [
+                _plan_task(
+                    rng, sequence, hazards_per_task, matrix, hazards, control_names, hazard_choice, preferred, personnel
+                )
+                for sequence in range(1, tasks_per_work_order + 1)
+            ]
+            for _ in batch
+        ]
+        for key, written in _write_batch(rng, batch, plans).items():
+            totals[key] += written
+        cache.bump_catalog_version(cache.WORK_ORDERS)
+        db.session.commit()
+
+    return GenerationSummary(
+        work_orders=work_orders,
+        hazards_added=hazards_added,
+        controls_added=controls_added,
+        **totals,
+    )
+
+
+def _grow_catalog(model: type, kinds: list[tuple[str, str]], size: int, rng: random.Random) -> int:
+    current = db.session.execute(select(func.count()).select_from(model)).scalar()
+    if current >= size:
+        return 0
+    taken = set(db.session.execute(select(model.name, model.category)).all())
+    rows = []
+    for serial in count(1):
+        if current + len(rows) >= size:
+            break
+        category, kind = kinds[serial % len(kinds)]
+        name = f"{kind} - {PLANT_AREAS[(serial // len(kinds)) % len(PLANT_AREAS)]} {serial:04d}"
+        if (name, category) in taken:
+            continue
+        row = {"name": name, "category": category, "description": f"Synthetic {kind.lower()} entry"}
+        if model is Hazard:
+            row.update(default_likelihood=rng.randint(1, 4), default_severity=rng.randint(2, 5))
+        rows.append(row)
+    db.session.execute(insert(model.__table__), rows)
+    cache.bump_catalog_version(cache.HAZARDS if model is Hazard else cache.CONTROLS)
+    return len(rows)
+
+
+def _plan_task(
+    rng: random.Random,
+    sequence: int,
+    hazards_per_task: int,
+    matrix: RiskMatrix,
+    hazards: dict,
+    control_names: dict[int, str],
+    hazard_choice: _SkewedChoice,
+    preferred: dict[int, _SkewedChoice],
+    personnel: list[str],
+) -> dict:
+    hazard_ids = hazard_choice.sample(rng, rng.randint(max(1, hazards_per_task - 1), hazards_per_task + 1))
+    primary = hazards[hazard_ids[0]]
+    likelihood = min(5, max(1, (primary.default_likelihood or 3) + rng.choice((-1, 0, 0, 1))))
+    severity = primary.default_severity or 3
+    residual_likelihood, residual_severity = max(likelihood - 1, 1), max(severity - rng.randint(0, 1), 1)
+    links = []
+    for hazard_id in hazard_ids:
+        existing = preferred[hazard_id].sample(rng, rng.randint(1, 3))
+        additional = preferred[hazard_id].sample(rng, 1) if rng.random() < 0.3 else []
+        links.append((hazard_id, existing, [control for control in additional if control not in existing]))
+    return {
+        "task": {
+            "sequence": sequence,
+            "activity": f"{rng.choice(ACTIVITIES)} - {rng.choice(PLANT_AREAS)}",
+            "hazard_description": primary.name,
+            "personnel_at_risk": rng.choice(personnel),
+            "existing_controls_summary": "; ".join(control_names[control_id] for control_id in links[0][1]),
+            "likelihood": likelihood,
+            "severity": severity,
+            "risk_score": likelihood * severity,
+            "risk_category_id": matrix.category_id_for(likelihood * severity),
+            "residual_likelihood": residual_likelihood,
+            "residual_severity": residual_severity,
+            "residual_risk_score": residual_likelihood * residual_severity,
+            "residual_risk_category_id": matrix.category_id_for(residual_likelihood * residual_severity),
+        },
+        "links": links,
+    }
+
+
+def _write_batch(rng: random.Random, numbers: list[str], plans: list[list[dict]]) -> dict[str, int]:
+    db.session.execute(
+        insert(WorkOrder.__table__),
+        [{"number": number, "title": f"Synthetic work order {number}", "description": rng.choice(PLANT_AREAS).title()}
+         for number in numbers],
+    )
+    work_order_ids = dict(
+        db.session.execute(select(WorkOrder.number, WorkOrder.id).where(WorkOrder.number.in_(numbers))).all()
+    )
+    ids = [work_order_ids[number] for number in numbers]
+    db.session.execute(
+        insert(MethodStatement.__table__),
+        [{"work_order_id": wo_id, "title": "Synthetic method statement", "source_filename": "generated.csv"}
+         for wo_id in ids],
+    )
+    statement_ids = dict(
+        db.session.execute(
+            select(MethodStatement.work_order_id, MethodStatement.id).where(MethodStatement.work_order_id.in_(ids))
+        ).all()
+    )
+
+    task_rows = []
+    for wo_id, plan in zip(ids, plans):
+        for planned in plan:
+            planned["task"].update(work_order_id=wo_id, method_statement_id=statement_ids[wo_id])
+            task_rows.append(planned["task"])
+    if not task_rows:
+        return {"tasks": 0, "task_hazards": 0, "task_controls": 0}
+    db.session.execute(insert(Task.__table__), task_rows)
+    heatmap.record_inserted_tasks(task_rows)
+    task_ids = {
+        (wo_id, sequence): task_id
+        for task_id, wo_id, sequence in db.session.execute(
+            select(Task.id, Task.work_order_id, Task.sequence).where(Task.work_order_id.in_(ids))
+        ).all()
+    }
+
+    hazard_rows, planned_controls = [], {}
+    for wo_id, plan in zip(ids, plans):
+        for planned in plan:
+            task_id = task_ids[(wo_id, planned["task"]["sequence"])]
+            for position, (hazard_id, existing, additional) in enumerate(planned["links"]):
+                hazard_rows.append({"task_id": task_id, "hazard_id": hazard_id, "is_primary": position == 0})
+                planned_controls[(task_id, hazard_id)] = (existing, additional)
+    db.session.execute(insert(TaskHazard.__table__), hazard_rows)
+
+    control_rows = []
+    for task_hazard_id, task_id, hazard_id in db.session.execute(
+        select(TaskHazard.id, TaskHazard.task_id, TaskHazard.hazard_id)
+        .join(Task)
+        .where(Task.work_order_id.in_(ids))
+        .order_by(TaskHazard.id)
+    ).all():
+        existing, additional = planned_controls[(task_id, hazard_id)]
+        for phase, control_ids in ((ControlPhase.EXISTING, existing), (ControlPhase.ADDITIONAL, additional)):
+            control_rows.extend(
+                {"task_id": task_id, "task_hazard_id": task_hazard_id, "control_id": control_id, "phase": phase}
+                for control_id in control_ids
+            )
+    if control_rows:
+        db.session.execute(insert(TaskControl.__table__), control_rows)
+    return {"tasks": len(task_rows), "task_hazards": len(hazard_rows), "task_controls": len(control_rows)}
@@ -0,0 +1,197 @@
+"""Likelihood x severity heatmaps backed by per-work-order cell counts.
+
+``risk_heatmap_cells`` holds, for each work order and phase, the number of tasks
+in every likelihood/severity cell, so a heatmap sums at most 25 rows per work
+order instead of reading the tasks. ORM flushes keep it current in the same
+transaction: new and deleted tasks, and the likelihood/severity edits that
+:meth:`Task.update_risk` scores, move counts between cells. Writes that bypass
+the unit of work must call :func:`record_inserted_tasks` (Core inserts) or
+:func:`record_deleted_tasks` (Core deletes) themselves, or rebuild. ``flask risk rebuild-heatmap`` recomputes the table from
+``tasks`` to repair drift.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Iterable, Mapping
+
+from sqlalchemy import bindparam, delete, event, func, inspect, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import RiskHeatmapCell, RiskPhase, Task, WorkOrder
+
+MATRIX_SIZE = 5
+PHASES = (RiskPhase.INITIAL, RiskPhase.RESIDUAL)
+PHASE_COLUMNS = {
+    RiskPhase.INITIAL: ("likelihood", "severity"),
+    RiskPhase.RESIDUAL: ("residual_likelihood", "residual_severity"),
+}
+
+# work_order_id, phase, likelihood, severity
+Cell = tuple[int, str, int, int]
+
+_UNKNOWN = object()
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def heatmap(phase: str, work_order: WorkOrder | None = None) -> list[list[int]]:
+    """Task counts for ``phase`` indexed ``[likelihood - 1][severity - 1]``.
+
+    Covers every work order unless ``work_order`` is given.
+    """
+    table = RiskHeatmapCell.__table__
+    query = (
+        select(table.c.likelihood, table.c.severity, func.sum(table.c.task_count))
+        .where(table.c.phase == phase)
+        .group_by(table.c.likelihood, table.c.severity)
+    )
+    if work_order is not None:
+        query = query.where(table.c.work_order_id == work_order.id)
+
+    grid = [[0] * MATRIX_SIZE for _ in range(MATRIX_SIZE)]
+    for likelihood, severity, task_count in db.session.execute(query).all():
+        grid[likelihood - 1][severity - 1] = int(task_count or 0)
+    return grid
+
+
+def record_inserted_tasks(rows: Iterable[Mapping[str, Any]], session: Session | None = None) -> None:
+    """Count tasks written with a Core ``INSERT``; ``rows`` are their column values."""
+    deltas: Counter[Cell] = Counter()
+    for row in rows:
+        for cell in _cells(row["work_order_id"], row.get):
+            deltas[cell] += 1
+    apply_deltas(deltas, session)
+
+
+def record_deleted_tasks(work_order_id: int, session: Session | None = None) -> None:
+    """Uncount every task of ``work_order_id`` ahead of a Core ``DELETE`` of them."""
+    session = session or db.session
+    tasks = Task.__table__
+    deltas: Counter[Cell] = Counter()
+    for phase, (likelihood_column, severity_column) in PHASE_COLUMNS.items():
+        likelihood = func.coalesce(tasks.c[likelihood_column], 1)
+        severity = func.coalesce(tasks.c[severity_column], 1)
+        rows = session.execute(
+            select(likelihood, severity, func.count())
+            .where(tasks.c.work_order_id == work_order_id)
+            .group_by(likelihood, severity)
+        ).all()
+        for cell_likelihood, cell_severity, task_count in rows:
+            deltas[(work_order_id, phase, cell_likelihood, cell_severity)] -= task_count
+    apply_deltas(deltas, session)
+
+
+def apply_deltas(deltas: Mapping[Cell, int], session: Session | None = None) -> None:
+    """Add each delta to its cell inside the current transaction."""
+    session = session or db.session
+    increments = [_cell_params(cell, n) for cell, n in deltas.items() if n > 0]
+    decrements = [_cell_params(cell, -n) for cell, n in deltas.items() if n < 0]
+    if not increments and not decrements:
+        return
+
+    table = RiskHeatmapCell.__table__
+    connection = session.connection()
+    if increments:
+        insert = _INSERTS[connection.dialect.name](table)
+        connection.execute(
+            insert.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key],
+                set_={"task_count": table.c.task_count + insert.excluded.task_count},
+            ),
+            increments,
+        )
+    if decrements:
+        # No upsert: a missing row belongs to a work order deleted in the same flush.
+        connection.execute(
+            update(table)
+            .where(
+                table.c.work_order_id == bindparam("b_work_order_id"),
+                table.c.phase == bindparam("b_phase"),
+                table.c.likelihood == bindparam("b_likelihood"),
+                table.c.severity == bindparam("b_severity"),
+            )
+            .values(task_count=table.c.task_count - bindparam("b_task_count")),
+            [{f"b_{key}": value for key, value in params.items()} for params in decrements],
+        )
+
+
+def rebuild_heatmap() -> int:
+    """Recompute every cell count from ``tasks``; returns the number of cells written."""
+    table, tasks = RiskHeatmapCell.__table__, Task.__table__
+    db.session.execute(delete(table))
+    for phase, (likelihood_column, severity_column) in PHASE_COLUMNS.items():
+        likelihood = func.coalesce(tasks.c[likelihood_column], 1)
+        severity = func.coalesce(tasks.c[severity_column], 1)
+        db.session.execute(
+            table.insert().from_select(
+                ["work_order_id", "phase", "likelihood", "severity", "task_count"],
+                select(tasks.c.work_order_id, literal(phase), likelihood, severity, func.count())
+                .group_by(tasks.c.work_order_id, likelihood, severity),
+            )
+        )
+    return db.session.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def _cells(work_order_id: int, value: Callable[[str], Any]) -> list[Cell]:
+    # Unset scores count as 1, as in Task.update_risk.
+    return [
+        (work_order_id, phase, value(likelihood) or 1, value(severity) or 1)
+        for phase, (likelihood, severity) in PHASE_COLUMNS.items()
+    ]
+
+
+def _cell_params(cell: Cell, task_count: int) -> dict[str, Any]:
+    work_order_id, phase, likelihood, severity = cell
+    return {
+        "work_order_id": work_order_id,
+        "phase": phase,
+        "likelihood": likelihood,
+        "severity": severity,
+        "task_count": task_count,
+    }
+
+
+def _old_and_new(task: Task) -> tuple[Callable[[str], Any], Callable[[str], Any]]:
+    """Pre- and post-flush column readers for a dirty task; unloaded values are unknown."""
+    attrs = inspect(task).attrs
+
+    def old(column: str) -> Any:
+        history = attrs[column].history
+        return (history.deleted or history.unchanged or (_UNKNOWN,))[0]
+
+    def new(column: str) -> Any:
+        history = attrs[column].history
+        return (history.added or history.unchanged or (_UNKNOWN,))[0]
+
+    return old, new
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_tasks(session: Session, flush_context) -> None:
+    # After the flush new tasks have their work order id; new/dirty/deleted and
+    # attribute history still describe what was flushed.
+    deltas: Counter[Cell] = Counter()
+    for task in session.new:
+        if isinstance(task, Task):
+            for cell in _cells(task.work_order_id, lambda column: getattr(task, column)):
+                deltas[cell] += 1
+
+    for task in session.deleted:
+        if isinstance(task, Task):
+            loaded = inspect(task).dict
+            for cell in _cells(loaded.get("work_order_id", _UNKNOWN), lambda column: loaded.get(column, _UNKNOWN)):
+                if _UNKNOWN not in cell:
+                    deltas[cell] -= 1
+
+    for task in session.dirty:
+        if isinstance(task, Task) and session.is_modified(task, include_collections=False):
+            old, new = _old_and_new(task)
+            for before, after in zip(_cells(old("work_order_id"), old), _cells(new("work_order_id"), new)):
+                # A changed column whose old value was never loaded cannot be moved;
+                # leave it for rebuild-heatmap rather than count the task twice.
+                if before != after and _UNKNOWN not in before and _UNKNOWN not in after:
+                    deltas[before] -= 1
+                    deltas[after] += 1
+
+    apply_deltas(deltas, session)
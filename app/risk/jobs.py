@@ -0,0 +1,108 @@
+"""Background method statement imports.
+
+Imports run on a small thread pool owned by the current worker process. Their
+state lives in the ``import_jobs`` table, so any worker can answer progress
+requests. A job whose process dies mid-import stays ``running``; the chunks it
+had already committed remain in place.
+"""
+from __future__ import annotations
+
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import Flask, current_app
+from sqlalchemy import update
+
+from ..extensions import db
+from ..models import ImportJob, ImportStatus, WorkOrder
+from ..profiling import profiled
+from . import services
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def submit_import(work_order: WorkOrder, csv_path: Path, replace: bool = True, profile: bool = False) -> ImportJob:
+    """Record a queued job for ``csv_path`` and hand it to the worker pool.
+
+    With ``profile`` the job runs under cProfile and is saved like a profiled request.
+    Raises ``UnicodeDecodeError`` or ``csv.Error`` if the file cannot be read as CSV.
+    """
+    job = ImportJob(
+        work_order=work_order,
+        source_filename=csv_path.name,
+        replace_existing=replace,
+        status=ImportStatus.QUEUED,
+        total_rows=_count_rows(csv_path),
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    _get_executor(app).submit(_run_import, app, job.id, csv_path, profile)
+    return job
+
+
+def _run_import(app: Flask, job_id: int, csv_path: Path, profile: bool = False) -> None:
+    capture = profiled(app, "import job", "JOB", f"/api/import-jobs/{job_id}") if profile else nullcontext({})
+    with app.app_context(), capture as profile_meta:
+        job = db.session.get(ImportJob, job_id)
+        job.status = ImportStatus.RUNNING
+        job.started_at = _utcnow()
+        db.session.commit()
+
+        try:
+            work_order = job.work_order
+            if job.replace_existing:
+                # Committed with the first chunk, so an import that fails early keeps the old tasks.
+                services.clear_work_order(work_order)
+            services.bulk_import_method_statement(
+                work_order,
+                csv_path,
+                progress=lambda rows: _record_progress(job_id, rows),
+            )
+        except Exception as exc:  # noqa: BLE001 - surfaced through the job record
+            app.logger.exception("Import job %s failed", job_id)
+            db.session.rollback()
+            _finish(job_id, ImportStatus.FAILED, error=str(exc))
+            profile_meta["status"] = ImportStatus.FAILED
+        else:
+            _finish(job_id, ImportStatus.SUCCEEDED)
+            profile_meta["status"] = ImportStatus.SUCCEEDED
+
+
+def _record_progress(job_id: int, rows: int) -> None:
+    db.session.execute(update(ImportJob).where(ImportJob.id == job_id).values(rows_processed=rows))
+
+
+def _finish(job_id: int, status: str, error: str | None = None) -> None:
+    db.session.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(status=status, error=error, finished_at=_utcnow())
+    )
+    db.session.commit()
+
+
+def _get_executor(app: Flask) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["IMPORT_WORKERS"], thread_name_prefix="rca-import"
+            )
+    return _executor
+
+
+def _count_rows(csv_path: Path) -> int:
+    # Counted as the import reads them: DictReader skips blank lines.
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
+        return sum(1 for _ in csv.DictReader(handle))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,84 @@
+"""In-memory hazard lookup used by the method statement importer."""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models import Hazard
+
+DEFAULT_LIKELIHOOD = 3
+DEFAULT_SEVERITY = 3
+
+_GRAM = 3
+
+
+class HazardMatcher:
+    """Resolve CSV hazard descriptions to catalog defaults without per-row queries.
+
+    A hazard matches when the description occurs, case-insensitively, anywhere in
+    its name -- the rule of the ``Hazard.name.ilike('%…%')`` lookup this replaces,
+    except that ``%`` and ``_`` in the description are matched literally. When
+    several hazards match, the one with the lowest id wins, which is the row the
+    unordered ``.first()`` returned on SQLite.
+
+    Names are indexed by character trigram, so a description only needs to be
+    checked against hazards sharing all of its trigrams; results are memoized per
+    distinct description because method statements repeat them heavily.
+    """
+
+    def __init__(self, hazards: Iterable[tuple[int, str, int | None, int | None]]):
+        self._names: list[str] = []
+        self._defaults: list[tuple[int, int]] = []
+        self._postings: dict[str, list[int]] = {}
+        for position, (_, name, likelihood, severity) in enumerate(sorted(hazards, key=lambda row: row[0])):
+            lowered = (name or "").lower()
+            self._names.append(lowered)
+            self._defaults.append((likelihood or DEFAULT_LIKELIHOOD, severity or DEFAULT_SEVERITY))
+            for gram in _grams(lowered):
+                postings = self._postings.setdefault(gram, [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+        self._memo: dict[str, tuple[int, int]] = {}
+
+    @classmethod
+    def from_catalog(cls) -> HazardMatcher:
+        rows = db.session.execute(
+            select(Hazard.id, Hazard.name, Hazard.default_likelihood, Hazard.default_severity)
+        ).all()
+        return cls(rows)
+
+    def defaults_for(self, hazard_description: str | None) -> tuple[int, int]:
+        """Return ``(likelihood, severity)`` for a description, falling back to 3/3."""
+        if not hazard_description:
+            return DEFAULT_LIKELIHOOD, DEFAULT_SEVERITY
+        needle = hazard_description.lower()
+        if needle not in self._memo:
+            position = self._first_match(needle)
+            self._memo[needle] = (
+                self._defaults[position] if position is not None else (DEFAULT_LIKELIHOOD, DEFAULT_SEVERITY)
+            )
+        return self._memo[needle]
+
+    def _first_match(self, needle: str) -> int | None:
+        if len(needle) < _GRAM:
+            candidates: Iterable[int] = range(len(self._names))
+        else:
+            postings = []
+            for gram in set(_grams(needle)):
+                posting = self._postings.get(gram)
+                if not posting:
+                    return None
+                postings.append(posting)
+            postings.sort(key=len)
+            shortest, others = postings[0], [set(posting) for posting in postings[1:]]
+            candidates = (position for position in shortest if all(position in other for other in others))
+        for position in candidates:
+            if needle in self._names[position]:
+                return position
+        return None
+
+
+def _grams(text: str) -> Iterable[str]:
+    return (text[index:index + _GRAM] for index in range(len(text) - _GRAM + 1))
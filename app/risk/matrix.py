@@ -0,0 +1,66 @@
+"""Precomputed 5×5 risk matrix lookup."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from ..models import RiskMatrixCategory
+
+MAX_SCORE = 25
+
+
+@dataclass(frozen=True)
+class RiskBand:
+    """Detached copy of a ``RiskMatrixCategory`` row that is safe to share between requests."""
+
+    id: int
+    name: str
+    color: str
+    guidance: str | None
+    min_score: int
+    max_score: int
+
+    @property
+    def label(self) -> str:
+        return self.name
+
+    @classmethod
+    def from_category(cls, category: RiskMatrixCategory) -> RiskBand:
+        return cls(
+            id=category.id,
+            name=category.name,
+            color=category.color,
+            guidance=category.guidance,
+            min_score=category.min_score,
+            max_score=category.max_score,
+        )
+
+
+class RiskMatrix:
+    """Score → category table with one slot per possible score (1-25).
+
+    Bands are expected in ``min_score`` order; where bands overlap the first one
+    wins, matching the linear scan this table replaces.
+    """
+
+    def __init__(self, bands: Iterable[RiskBand]):
+        self.bands: tuple[RiskBand, ...] = tuple(bands)
+        slots: list[RiskBand | None] = [None] * (MAX_SCORE + 1)
+        for band in self.bands:
+            for score in range(max(band.min_score, 1), min(band.max_score, MAX_SCORE) + 1):
+                if slots[score] is None:
+                    slots[score] = band
+        self._slots = tuple(slots)
+
+    @classmethod
+    def from_categories(cls, categories: Iterable[RiskMatrixCategory]) -> RiskMatrix:
+        return cls(RiskBand.from_category(category) for category in categories)
+
+    def band_for(self, score: int) -> RiskBand | None:
+        if 1 <= score <= MAX_SCORE:
+            return self._slots[score]
+        return None
+
+    def category_id_for(self, score: int) -> int | None:
+        band = self.band_for(score)
+        return band.id if band else None
@@ -0,0 +1,86 @@
+"""Set-based reassignment of task risk categories after the matrix bands change.
+
+A task stores the category its score fell into when it was last scored, so
+editing a band's ``min_score``/``max_score`` leaves existing tasks pointing at
+the old bands. :func:`rescore_tasks` fixes them with one ``UPDATE`` per phase
+whose ``CASE`` maps score ranges to category ids, touching only rows whose
+category actually changes. Scores themselves are unchanged.
+
+ORM changes to band bounds trigger it from an ``after_flush`` hook, in the same
+transaction as the edit. Edits made outside the app (SQL, ``risk_matrix.yml``)
+are applied with ``flask risk rescore``.
+"""
+from __future__ import annotations
+
+from itertools import chain, groupby
+
+from sqlalchemy import case, event, inspect, null, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..extensions import db
+from ..models import RiskMatrixCategory, Task
+from .matrix import MAX_SCORE, RiskMatrix
+
+# Running total of tasks rescored by the hook, kept in ``Session.info``.
+RESCORED_KEY = "rescored_tasks"
+
+_BOUND_COLUMNS = ("min_score", "max_score")
+
+
+def rescore_tasks(matrix: RiskMatrix, session: Session | None = None) -> int:
+    """Point every task's initial and residual category at ``matrix``'s band for its score.
+
+    Returns the number of category values changed. Task objects already loaded
+    in the session keep their old category until they are expired or reloaded.
+    """
+    session = session or db.session
+    tasks = Task.__table__
+    connection = session.connection()
+    changed = 0
+    for score, category_id in (
+        (tasks.c.risk_score, tasks.c.risk_category_id),
+        (tasks.c.residual_risk_score, tasks.c.residual_risk_category_id),
+    ):
+        band = category_case(score, matrix)
+        result = connection.execute(
+            update(tasks).where(category_id.is_distinct_from(band)).values({category_id.name: band})
+        )
+        changed += result.rowcount
+    return changed
+
+
+def category_case(score: ColumnElement, matrix: RiskMatrix) -> ColumnElement:
+    """``CASE`` giving the category id for ``score``, one ``BETWEEN`` per run of scores in a band."""
+    whens = []
+    for category_id, run in groupby(range(1, MAX_SCORE + 1), key=matrix.category_id_for):
+        scores = list(run)
+        if category_id is not None:
+            whens.append((score.between(scores[0], scores[-1]), category_id))
+    return case(*whens, else_=null()) if whens else null()
+
+
+def current_matrix(session: Session | None = None) -> RiskMatrix:
+    """The bands as stored right now, bypassing the process-level matrix cache."""
+    session = session or db.session
+    table = RiskMatrixCategory.__table__
+    rows = session.connection().execute(select(table).order_by(table.c.min_score)).all()
+    return RiskMatrix.from_categories(rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _rescore_after_band_changes(session: Session, flush_context) -> None:
+    bands_changed = any(isinstance(obj, RiskMatrixCategory) for obj in chain(session.new, session.deleted)) or any(
+        isinstance(obj, RiskMatrixCategory)
+        and any(inspect(obj).attrs[column].history.has_changes() for column in _BOUND_COLUMNS)
+        for obj in session.dirty
+    )
+    if bands_changed:
+        rescored = rescore_tasks(current_matrix(session), session)
+        session.info[RESCORED_KEY] = session.info.get(RESCORED_KEY, 0) + rescored
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_rescored_count(session: Session) -> None:
+    session.info.pop(RESCORED_KEY, None)
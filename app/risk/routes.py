@@ -1,26 +1,37 @@
 """HTTP routes for the risk assessment blueprint."""
 from __future__ import annotations
 
+import csv
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, Mapping
+from uuid import uuid4
 
-from flask import (Blueprint, abort, current_app, jsonify, render_template,
-                   request)
+from flask import (Blueprint, Response, abort, current_app, jsonify,
+                   render_template, request, stream_with_context, url_for)
+from werkzeug.utils import secure_filename
 
 from ..extensions import csrf, db
-from ..models import ControlMeasure, ControlPhase, Hazard, PersonnelAtRisk, Task, TaskHazard, WorkOrder
-from . import risk_bp
+from ..models import (ControlMeasure, ControlPhase, Hazard, ImportJob, PersonnelAtRisk, RiskPhase, Task,
+                      TaskControl, TaskHazard, WorkOrder)
+from ..profiling import profiling_requested
+from . import cache, heatmap, jobs, risk_bp, search, sync
 from . import services
 
+BOOTSTRAP_CATALOGS = (cache.CONTROLS, cache.HAZARDS, cache.RISK_MATRIX, cache.PERSONNEL, cache.WORK_ORDERS)
+MAX_TASK_PAGE_SIZE = 500
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+NORMALIZED_FORMAT = "normalized"
+
 
 @risk_bp.route("/")
 def index() -> str:
-    categories = services.load_risk_categories()
+    matrix = services.load_risk_matrix()
     hazards = Hazard.query.order_by(Hazard.category, Hazard.name).limit(10).all()
     controls = ControlMeasure.query.order_by(ControlMeasure.category, ControlMeasure.name).limit(10).all()
     return render_template(
         "index.html",
-        risk_categories=categories,
+        risk_categories=matrix.bands,
         hazards=hazards,
         controls=controls,
     )
@@ -38,31 +49,65 @@ def controls() -> str:
     return render_template("controls.html")
 
 
+@risk_bp.get("/api/bootstrap")
+def api_bootstrap():
+    """Every reference dataset the assessment page needs, as one cacheable document."""
+    return _catalog_response(BOOTSTRAP_CATALOGS, bootstrap_payload)
+
+
 @risk_bp.get("/api/risk-matrix")
 def api_risk_matrix():
-    categories = services.load_risk_categories()
-    return jsonify({"risk_categories": [risk_category_to_dict(cat) for cat in categories]})
+    return _catalog_response(cache.RISK_MATRIX, risk_matrix_payload)
+
+
+@risk_bp.get("/api/analytics/heatmap")
+def api_risk_heatmap():
+    """Task counts per likelihood/severity cell, plant-wide (``scope=all``) or for ``wo=<number>``."""
+    phase = request.args.get("phase", RiskPhase.INITIAL)
+    if phase not in heatmap.PHASES:
+        abort(400, description=f"phase must be one of: {', '.join(heatmap.PHASES)}")
+
+    work_order = None
+    wo_number = request.args.get("wo")
+    if wo_number:
+        work_order = services.get_work_order_by_number(wo_number)
+        if not work_order:
+            abort(404, description="Work order not found")
+    elif request.args.get("scope", "all") != "all":
+        abort(400, description="Use scope=all or wo=<work order number>")
+
+    grid = heatmap.heatmap(phase, work_order)
+    return jsonify({
+        "phase": phase,
+        "work_order": work_order.number if work_order else None,
+        "total": sum(map(sum, grid)),
+        "cells": [
+            {
+                "likelihood": likelihood,
+                "severity": severity,
+                "risk_score": likelihood * severity,
+                "count": grid[likelihood - 1][severity - 1],
+            }
+            for likelihood in range(1, heatmap.MATRIX_SIZE + 1)
+            for severity in range(1, heatmap.MATRIX_SIZE + 1)
+        ],
+    })
 
 
 @risk_bp.get("/api/work-orders")
 def api_list_work_orders():
     """Get all work orders for dropdown selection."""
-    work_orders = WorkOrder.query.order_by(WorkOrder.number).all()
-    return jsonify({
-        "work_orders": [
-            {
-                "number": wo.number,
-                "title": wo.title,
-                "description": wo.description
-            }
-            for wo in work_orders
-        ]
-    })
+    return _catalog_response(cache.WORK_ORDERS, work_orders_payload)
 
 
 @risk_bp.get("/api/catalog/hazards")
 def api_list_hazards():
-    hazards = Hazard.query.order_by(Hazard.category, Hazard.name).all()
+    return _catalog_response(cache.HAZARDS, hazards_payload)
+
+
+@risk_bp.get("/api/catalog/hazards/search")
+def api_search_hazards():
+    hazards = search.search_catalog(search.HAZARDS, request.args.get("q", ""), _search_limit())
     return jsonify({"hazards": [hazard_to_dict(h) for h in hazards]})
 
 
@@ -123,7 +168,12 @@ def api_delete_hazard(hazard_id: int):
 
 @risk_bp.get("/api/catalog/controls")
 def api_list_controls():
-    controls = ControlMeasure.query.order_by(ControlMeasure.category, ControlMeasure.name).all()
+    return _catalog_response(cache.CONTROLS, controls_payload)
+
+
+@risk_bp.get("/api/catalog/controls/search")
+def api_search_controls():
+    controls = search.search_catalog(search.CONTROLS, request.args.get("q", ""), _search_limit())
     return jsonify({"controls": [control_to_dict(c) for c in controls]})
 
 
@@ -176,8 +226,7 @@ def api_delete_control(control_id: int):
 
 @risk_bp.get("/api/catalog/personnel")
 def api_list_personnel():
-    personnel = PersonnelAtRisk.query.order_by(PersonnelAtRisk.name).all()
-    return jsonify({"personnel": [personnel_to_dict(p) for p in personnel]})
+    return _catalog_response(cache.PERSONNEL, personnel_payload)
 
 
 @risk_bp.post("/api/catalog/personnel")
@@ -221,56 +270,150 @@ def api_get_work_order(wo_number: str):
     if not work_order:
         abort(404, description="Work order not found")
 
-    tasks = services.get_tasks_for_work_order(wo_number)
+    normalized = _normalized_requested()
+    if _payload_flag(request.args, "stream", False):
+        return Response(
+            stream_with_context(_stream_work_order(work_order, normalized)),
+            mimetype="application/json",
+        )
+
+    tasks = services.load_work_order_tasks(work_order)
+    return jsonify({"work_order": work_order_to_dict(work_order), **_tasks_payload(tasks, normalized)})
+
+
+def _stream_work_order(work_order: WorkOrder, normalized: bool = False) -> Iterator[str]:
+    """Write the ``api_get_work_order`` document incrementally, one task at a time.
+
+    In the normalized format the lookup tables follow the task list, once every
+    referenced hazard and control has been seen.
+    """
+    def dumps(value: Any) -> str:
+        return current_app.json.dumps(value, separators=(",", ":"))
+
+    lookup = _new_lookup()
+    yield f'{{"work_order":{dumps(work_order_to_dict(work_order))},"tasks":['
+    for index, task in enumerate(services.iter_work_order_tasks(work_order)):
+        data = normalized_task_to_dict(task, lookup) if normalized else task_to_dict(task)
+        yield ("," if index else "") + dumps(data)
+    yield "]"
+    if normalized:
+        yield f',"format":"{NORMALIZED_FORMAT}","hazards":{dumps(lookup["hazards"])},"controls":{dumps(lookup["controls"])}'
+    yield "}"
+
+
+@risk_bp.get("/api/work-orders/<wo_number>/tasks")
+def api_list_work_order_tasks(wo_number: str):
+    """One keyset page of a work order's tasks; follow ``next`` for the following page."""
+    work_order = services.get_work_order_by_number(wo_number)
+    if not work_order:
+        abort(404, description="Work order not found")
+
+    after = request.args.get("after", type=int)
+    after_id = request.args.get("after_id", type=int)
+    limit = request.args.get("limit", default=services.TASK_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_TASK_PAGE_SIZE))
+
+    tasks, has_more = services.load_work_order_task_page(work_order, after, after_id, limit)
+    next_cursor = {"after": tasks[-1].sequence, "after_id": tasks[-1].id} if has_more else None
     return jsonify({
         "work_order": work_order_to_dict(work_order),
-        "tasks": [task_to_dict(task) for task in tasks],
+        **_tasks_payload(tasks, _normalized_requested()),
+        "next": next_cursor,
     })
 
 
+@risk_bp.get("/api/work-orders/<wo_number>/changes")
+def api_work_order_changes(wo_number: str):
+    """Tasks changed or deleted since ``?since=<token>``; poll again with ``next``.
+
+    Without ``since`` only a token is returned, to take before loading the tasks.
+    """
+    work_order = services.get_work_order_by_number(wo_number)
+    if not work_order:
+        abort(404, description="Work order not found")
+
+    normalized = _normalized_requested()
+    try:
+        changes = sync.changes_since(work_order, request.args.get("since"))
+    except ValueError as exc:
+        abort(400, description=str(exc))
+    tasks = services.load_tasks(changes.task_ids) if changes.task_ids else []
+    response = jsonify({
+        **_tasks_payload(tasks, normalized),
+        "deleted_task_ids": sorted(changes.deleted_task_ids),
+        "next": changes.next_token,
+        "reset": changes.reset,
+    })
+    response.cache_control.no_store = True
+    return response
+
+
+def _normalized_requested() -> bool:
+    """Whether ``?format=`` asks for the normalized work order payload."""
+    response_format = request.args.get("format", "full")
+    if response_format not in {"full", NORMALIZED_FORMAT}:
+        abort(400, description=f"Unsupported format: {response_format}")
+    return response_format == NORMALIZED_FORMAT
+
+
+def _tasks_payload(tasks: list[Task], normalized: bool) -> dict[str, Any]:
+    if not normalized:
+        return {"tasks": [task_to_dict(task) for task in tasks]}
+    lookup = _new_lookup()
+    return {
+        "format": NORMALIZED_FORMAT,
+        "tasks": [normalized_task_to_dict(task, lookup) for task in tasks],
+        **lookup,
+    }
+
+
 @risk_bp.post("/api/work-orders/<wo_number>/import")
 @csrf.exempt
 def api_import_work_order(wo_number: str):
+    """Queue a method statement import and return the job to poll for progress."""
     payload = request.get_json(silent=True) or {}
     if request.form:
         payload.update(request.form.to_dict())
 
-    replace_value = payload.get("replace", True)
-    if isinstance(replace_value, str):
-        replace = replace_value.lower() not in {"false", "0", "no"}
-    else:
-        replace = bool(replace_value)
-
-    if replace:
-        for task in list(work_order.tasks):
-            db.session.delete(task)
-        for ms in list(work_order.method_statements):
-            db.session.delete(ms)
-        db.session.flush()
-
     csv_path: Path | None = None
     if "filename" in payload:
-        csv_path = Path(current_app.root_path).parent / "data" / "method_statements" / payload["filename"]
-        if not csv_path.exists():
+        filename = secure_filename(payload["filename"])
+        csv_path = Path(current_app.root_path).parent / "data" / "method_statements" / filename
+        if not filename or not csv_path.is_file():
             abort(400, description="Specified CSV file not found in data directory")
     elif "file" in request.files:
-        upload_dir = Path(current_app.instance_path) / "uploads"
-        upload_dir.mkdir(parents=True, exist_ok=True)
         uploaded = request.files["file"]
-        csv_path = upload_dir / uploaded.filename
+        filename = secure_filename(uploaded.filename or "")
+        if not filename:
+            abort(400, description="Uploaded file needs a name")
+        # One directory per upload: same-named files queued together must not overwrite each other.
+        upload_dir = Path(current_app.instance_path) / "uploads" / uuid4().hex
+        upload_dir.mkdir(parents=True)
+        csv_path = upload_dir / filename
         uploaded.save(csv_path)
     else:
         abort(400, description="Provide either filename in payload or upload file")
 
-    categories = services.load_risk_categories()
-    services.import_method_statement(work_order, csv_path, categories)
-    db.session.commit()
-
-    tasks = services.get_tasks_for_work_order(wo_number)
-    return jsonify({
-        "work_order": work_order_to_dict(work_order),
-        "tasks": [task_to_dict(task) for task in tasks],
-    }), 201
+    work_order = services.get_or_create_work_order(wo_number, payload.get("title"))
+    try:
+        job = jobs.submit_import(
+            work_order,
+            csv_path,
+            replace=_payload_flag(payload, "replace", True),
+            profile=profiling_requested(),
+        )
+    except (UnicodeDecodeError, csv.Error) as exc:
+        abort(400, description=f"Could not read the CSV file: {exc}")
+    response = jsonify({"job": import_job_to_dict(job)})
+    response.status_code = 202
+    response.headers["Location"] = url_for("risk.api_get_import_job", job_id=job.id)
+    return response
+
+
+@risk_bp.get("/api/import-jobs/<int:job_id>")
+def api_get_import_job(job_id: int):
+    job = ImportJob.query.get_or_404(job_id)
+    return jsonify({"job": import_job_to_dict(job)})
 
 
 @risk_bp.post("/api/tasks")
@@ -284,7 +427,7 @@ def api_create_task():
 
     task = Task(
         work_order=work_order,
-        sequence=payload.get("sequence", len(work_order.tasks) + 1),
+        sequence=payload.get("sequence") or services.next_task_sequence(work_order),
         activity=payload.get("activity", "New Task"),
         hazard_description=payload.get("hazard_description", ""),
         personnel_at_risk=payload.get("personnel_at_risk", ""),
@@ -305,6 +448,26 @@ def api_update_task(task_id: int):
     return jsonify({"task": task_to_dict(task)})
 
 
+@risk_bp.patch("/api/tasks")
+@csrf.exempt
+def api_update_tasks():
+    """Apply a batch of inline edits in one transaction and return the changed tasks."""
+    payload = request.get_json(force=True)
+    edits = payload.get("edits", []) if isinstance(payload, dict) else payload
+    if not isinstance(edits, list):
+        abort(400, description="Provide a list of {id, fields} edits")
+    try:
+        changed = services.update_tasks(edits)
+    except LookupError as exc:
+        abort(404, description=str(exc))
+    except (KeyError, TypeError, ValueError) as exc:
+        abort(400, description=str(exc))
+    changed_ids = [task.id for task in changed]
+    db.session.commit()
+    tasks = services.load_tasks(changed_ids) if changed_ids else []
+    return jsonify({"tasks": [task_to_dict(task) for task in tasks]})
+
+
 @risk_bp.delete("/api/tasks/<int:task_id>")
 @csrf.exempt
 def api_delete_task(task_id: int):
@@ -361,7 +524,117 @@ def api_update_hazard_controls(task_id: int, hazard_id: int):
     return jsonify({"task": task_to_dict(task_hazard.task)})
 
 
+def _search_limit() -> int:
+    limit = request.args.get("limit", default=SEARCH_LIMIT, type=int)
+    return max(1, min(limit, MAX_SEARCH_LIMIT))
+
+
+def _payload_flag(payload: Mapping[str, Any], key: str, default: bool) -> bool:
+    value = payload.get(key, default)
+    if isinstance(value, str):
+        return value.lower() not in {"false", "0", "no"}
+    return bool(value)
+
+
+def _catalog_response(names: str | tuple[str, ...], build_payload: Callable[[], dict[str, Any]]) -> Response:
+    """Serve catalog data, answering ``If-None-Match`` from the catalogs' version stamps.
+
+    A matching tag short-circuits to ``304`` before any catalog row is read; otherwise
+    the serialized body is reused until one of the stamps changes.
+    """
+    etag = cache.catalog_etag(names)
+    # Weak from the start: compression (app/compression.py) would weaken it on the
+    # 200 only, and a 304 must carry the same validator.
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = cache.get_or_build(names, lambda: current_app.json.dumps(build_payload()), key="json")
+        etag = cache.catalog_etag(names)
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
+
+
+def _cached_payload(name: str, build_payload: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    return cache.get_or_build(name, build_payload, key="payload")
+
+
+def bootstrap_payload() -> dict[str, Any]:
+    payload: dict[str, Any] = {}
+    payload.update(_cached_payload(cache.CONTROLS, controls_payload))
+    payload.update(_cached_payload(cache.HAZARDS, hazards_payload))
+    payload.update(_cached_payload(cache.RISK_MATRIX, risk_matrix_payload))
+    payload.update(_cached_payload(cache.PERSONNEL, personnel_payload))
+    payload.update(_cached_payload(cache.WORK_ORDERS, work_orders_payload))
+    return payload
+
+
+def risk_matrix_payload() -> dict[str, Any]:
+    matrix = services.load_risk_matrix()
+    return {"risk_categories": [risk_category_to_dict(band) for band in matrix.bands]}
+
+
+def work_orders_payload() -> dict[str, Any]:
+    work_orders = WorkOrder.query.order_by(WorkOrder.number).all()
+    return {
+        "work_orders": [
+            {
+                "number": wo.number,
+                "title": wo.title,
+                "description": wo.description
+            }
+            for wo in work_orders
+        ]
+    }
+
+
+def hazards_payload() -> dict[str, Any]:
+    hazards = Hazard.query.order_by(Hazard.category, Hazard.name).all()
+    return {"hazards": [hazard_to_dict(h) for h in hazards]}
+
+
+def controls_payload() -> dict[str, Any]:
+    controls = ControlMeasure.query.order_by(ControlMeasure.category, ControlMeasure.name).all()
+    return {"controls": [control_to_dict(c) for c in controls]}
+
+
+def personnel_payload() -> dict[str, Any]:
+    personnel = PersonnelAtRisk.query.order_by(PersonnelAtRisk.name).all()
+    return {"personnel": [personnel_to_dict(p) for p in personnel]}
+
+
 def task_to_dict(task: Task) -> dict[str, Any]:
+    data = _task_fields(task)
+    data.update({
+        "controls": {
+            "existing": [control_to_dict(link.control) for link in task.controls if link.phase == ControlPhase.EXISTING],
+            "additional": [control_to_dict(link.control) for link in task.controls if link.phase == ControlPhase.ADDITIONAL],
+        },
+        "hazards": [task_hazard_to_dict(link) for link in task.hazards],
+    })
+    return data
+
+
+def normalized_task_to_dict(task: Task, lookup: dict[str, dict[int, Any]]) -> dict[str, Any]:
+    """``task_to_dict`` with hazards and controls referenced by ID.
+
+    Each referenced catalog entry is added once to ``lookup`` (see ``_new_lookup``),
+    which the response carries alongside the tasks. Task controls become bare IDs;
+    hazard links and their controls keep their link fields next to the ``id``.
+    """
+    data = _task_fields(task)
+    data.update({
+        "controls": {
+            "existing": [_control_ref(link.control, lookup) for link in task.controls if link.phase == ControlPhase.EXISTING],
+            "additional": [_control_ref(link.control, lookup) for link in task.controls if link.phase == ControlPhase.ADDITIONAL],
+        },
+        "hazards": [normalized_task_hazard_to_dict(link, lookup) for link in task.hazards],
+    })
+    return data
+
+
+def _task_fields(task: Task) -> dict[str, Any]:
     return {
         "id": task.id,
         "sequence": task.sequence,
@@ -374,11 +647,6 @@ def task_to_dict(task: Task) -> dict[str, Any]:
         "severity": task.severity,
         "risk_score": task.risk_score,
         "risk_category": risk_category_to_dict(task.risk_category) if task.risk_category else None,
-        "controls": {
-            "existing": [control_to_dict(link.control) for link in task.controls if link.phase == ControlPhase.EXISTING],
-            "additional": [control_to_dict(link.control) for link in task.controls if link.phase == ControlPhase.ADDITIONAL],
-        },
-        "hazards": [task_hazard_to_dict(link) for link in task.hazards],
         "target_completion_date": task.target_completion_date.isoformat() if task.target_completion_date else None,
         "residual_likelihood": task.residual_likelihood,
         "residual_severity": task.residual_severity,
@@ -403,6 +671,45 @@ def task_hazard_to_dict(link: TaskHazard) -> dict[str, Any]:
     })
     return hazard_data
 
+
+def normalized_task_hazard_to_dict(link: TaskHazard, lookup: dict[str, dict[int, Any]]) -> dict[str, Any]:
+    return {
+        "id": _hazard_ref(link.hazard, lookup),
+        "parameter_value": link.parameter_value,
+        "is_primary": link.is_primary,
+        "notes": link.notes,
+        "controls": {
+            "existing": [normalized_task_control_to_dict(control_link, lookup) for control_link in link.controls if control_link.phase == ControlPhase.EXISTING],
+            "additional": [normalized_task_control_to_dict(control_link, lookup) for control_link in link.controls if control_link.phase == ControlPhase.ADDITIONAL],
+        },
+    }
+
+
+def normalized_task_control_to_dict(task_control: TaskControl, lookup: dict[str, dict[int, Any]]) -> dict[str, Any]:
+    return {
+        "id": _control_ref(task_control.control, lookup),
+        "parameter_value": task_control.notes,
+        "phase": task_control.phase,
+    }
+
+
+def _new_lookup() -> dict[str, dict[int, Any]]:
+    """Lookup tables of the normalized format: catalog entries keyed by ID."""
+    return {"hazards": {}, "controls": {}}
+
+
+def _hazard_ref(hazard: Hazard, lookup: dict[str, dict[int, Any]]) -> int:
+    if hazard.id not in lookup["hazards"]:
+        lookup["hazards"][hazard.id] = hazard_to_dict(hazard)
+    return hazard.id
+
+
+def _control_ref(control: ControlMeasure, lookup: dict[str, dict[int, Any]]) -> int:
+    if control.id not in lookup["controls"]:
+        lookup["controls"][control.id] = control_to_dict(control)
+    return control.id
+
+
 def hazard_to_dict(hazard: Hazard) -> dict[str, Any]:
     return {
         "id": hazard.id,
@@ -458,6 +765,20 @@ def work_order_to_dict(work_order: WorkOrder) -> dict[str, Any]:
     }
 
 
+def import_job_to_dict(job: ImportJob) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "work_order_number": job.work_order.number,
+        "source_filename": job.source_filename,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "rows_processed": job.rows_processed,
+        "error": job.error,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
 def risk_category_to_dict(category) -> dict[str, Any] | None:
     if category is None:
         return None
@@ -0,0 +1,143 @@
+"""Full-text search over the hazard and control catalogs.
+
+On SQLite each catalog gets an external-content FTS5 table that triggers keep in
+sync, so every write path (API, seed scripts, bulk inserts) updates the index.
+Other databases fall back to case-insensitive substring matching.
+"""
+from __future__ import annotations
+
+import re
+from typing import Sequence
+
+from sqlalchemy import and_, event, or_, text
+
+from ..extensions import db
+from ..models import ControlMeasure, Hazard
+
+HAZARDS = "hazards"
+CONTROLS = "controls"
+
+# catalog name -> (FTS table, catalog model)
+SEARCH_INDEXES: dict[str, tuple[str, type]] = {
+    HAZARDS: ("hazards_fts", Hazard),
+    CONTROLS: ("control_measures_fts", ControlMeasure),
+}
+
+# bm25 column weights for (name, category, description): a name hit outranks the rest.
+_RANK_WEIGHTS = "10.0, 4.0, 1.0"
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+_ensured: set[str] = set()
+
+
+def search_catalog(catalog: str, query: str, limit: int) -> list:
+    """Return up to ``limit`` catalog rows matching every term of ``query`` as a prefix, best first."""
+    tokens = _TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return []
+    fts_table, model = SEARCH_INDEXES[catalog]
+    if db.session.get_bind().dialect.name != "sqlite":
+        return _substring_search(model, tokens, limit)
+
+    ensure_search_indexes()
+    expression = " ".join(f'"{token}"*' for token in tokens)
+    ids = db.session.execute(
+        text(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :expression "
+            f"ORDER BY bm25({fts_table}, {_RANK_WEIGHTS}) LIMIT :limit"
+        ),
+        {"expression": expression, "limit": limit},
+    ).scalars().all()
+    rows = {row.id: row for row in model.query.filter(model.id.in_(ids)).all()}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
+
+def ensure_search_indexes() -> None:
+    """Create any missing FTS table (databases that predate search) once per process."""
+    if len(_ensured) == len(SEARCH_INDEXES):
+        return
+    connection = db.session.connection()
+    created = False
+    for fts_table, model in SEARCH_INDEXES.values():
+        if fts_table in _ensured:
+            continue
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts_table}
+        ).first()
+        if not exists:
+            _create_index(connection, fts_table, model.__tablename__)
+            created = True
+        _ensured.add(fts_table)
+    if created:
+        db.session.commit()
+
+
+def rebuild_search_indexes() -> bool:
+    """Recreate every FTS table and triggers from the catalog tables.
+
+    Returns ``False`` without touching the database when it is not SQLite, which
+    searches the catalogs directly.
+    """
+    if db.session.get_bind().dialect.name != "sqlite":
+        return False
+    connection = db.session.connection()
+    for fts_table, model in SEARCH_INDEXES.values():
+        connection.execute(text(f"DROP TABLE IF EXISTS {fts_table}"))
+        _create_index(connection, fts_table, model.__tablename__)
+        _ensured.add(fts_table)
+    db.session.commit()
+    return True
+
+
+def _create_index(connection, fts_table: str, source_table: str) -> None:
+    columns = "name, category, description"
+    old_values = "'delete', old.id, old.name, old.category, old.description"
+    new_values = "new.id, new.name, new.category, new.description"
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{columns}, content='{source_table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source_table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {source_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values}); END",
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _substring_search(model: type, tokens: Sequence[str], limit: int) -> list:
+    conditions = [
+        or_(
+            model.name.ilike(f"%{token}%"),
+            model.category.ilike(f"%{token}%"),
+            model.description.ilike(f"%{token}%"),
+        )
+        for token in tokens
+    ]
+    return model.query.filter(and_(*conditions)).order_by(model.name).limit(limit).all()
+
+
+def _register_ddl_events() -> None:
+    for fts_table, model in SEARCH_INDEXES.values():
+
+        def after_create(target, connection, fts_table=fts_table, **kw):
+            if connection.dialect.name == "sqlite":
+                _create_index(connection, fts_table, target.name)
+                _ensured.add(fts_table)
+
+        def before_drop(target, connection, fts_table=fts_table, **kw):
+            if connection.dialect.name == "sqlite":
+                connection.execute(text(f"DROP TABLE IF EXISTS {fts_table}"))
+                _ensured.discard(fts_table)
+
+        event.listen(model.__table__, "after_create", after_create)
+        event.listen(model.__table__, "before_drop", before_drop)
+
+
+_register_ddl_events()
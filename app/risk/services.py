@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import csv
 from datetime import date
+from itertools import count, islice
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator
 
 import yaml
 from flask import current_app
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.orm import selectinload
 
 from ..extensions import db
 from ..models import (
@@ -23,6 +24,13 @@ from ..models import (
     TaskHazard,
     WorkOrder,
 )
+from . import cache, heatmap, rescoring, sync  # noqa: F401 - rescoring registers a flush hook
+from .matching import HazardMatcher
+from .matrix import RiskMatrix
+
+IMPORT_CHUNK_SIZE = 1000
+TASK_PAGE_SIZE = 100
+STREAM_BATCH_SIZE = 500
 
 
 def load_risk_categories(cache: bool = True) -> list[RiskMatrixCategory]:
@@ -31,9 +39,7 @@ def load_risk_categories(cache: bool = True) -> list[RiskMatrixCategory]:
     if categories:
         return categories
 
-    config_path = Path(current_app.config["RISK_MATRIX_DEFAULT"])
-    data = yaml.safe_load(config_path.read_text(encoding="utf-8"))
-    for entry in data.get("risk_categories", []):
+    for entry in _default_risk_categories():
         category = RiskMatrixCategory(
             name=entry["label"],
             color=entry["color"],
@@ -46,18 +52,52 @@ def load_risk_categories(cache: bool = True) -> list[RiskMatrixCategory]:
     return RiskMatrixCategory.query.order_by(RiskMatrixCategory.min_score).all()
 
 
+def sync_risk_categories() -> int:
+    """Update the stored bands to match ``RISK_MATRIX_DEFAULT``, matching on label.
+
+    Categories missing from the file are left alone. Changed bounds rescore the
+    tasks when the session flushes (see ``rescoring.py``). Returns the number of
+    categories added or changed; the caller commits.
+    """
+    existing = {category.name: category for category in RiskMatrixCategory.query.all()}
+    changed = 0
+    for entry in _default_risk_categories():
+        category = existing.get(entry["label"])
+        if category is None:
+            category = RiskMatrixCategory(name=entry["label"])
+            db.session.add(category)
+        category.color = entry["color"]
+        category.guidance = entry["guidance"]
+        category.min_score = entry["min_score"]
+        category.max_score = entry["max_score"]
+        if category.id is None or db.session.is_modified(category):
+            changed += 1
+    return changed
+
+
+def _default_risk_categories() -> list[dict]:
+    config_path = Path(current_app.config["RISK_MATRIX_DEFAULT"])
+    data = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    return data.get("risk_categories", [])
+
+
+def load_risk_matrix() -> RiskMatrix:
+    """Return the process-wide score lookup, rebuilding it after risk matrix edits."""
+    return cache.get_or_build(cache.RISK_MATRIX, lambda: RiskMatrix.from_categories(load_risk_categories()))
+
+
 def bootstrap_seed_data() -> None:
     """Populate the database with baseline hazards, controls, and sample work orders."""
-    categories = load_risk_categories()
+    matrix = load_risk_matrix()
 
     _seed_hazards()
     _seed_controls()
-    _seed_power_plant_work_orders(categories)
+    _seed_power_plant_work_orders(matrix)
     
     db.session.commit()
 
 
-def _seed_power_plant_work_orders(categories: Sequence[RiskMatrixCategory]) -> None:
+def _seed_power_plant_work_orders(matrix: RiskMatrix) -> None:
     """Create power plant work orders with realistic tasks."""
     
     work_orders = [
@@ -83,10 +123,10 @@ def _seed_power_plant_work_orders(categories: Sequence[RiskMatrixCategory]) -> N
             work_order = WorkOrder(number=wo_num, title=title, description=desc)
             db.session.add(work_order)
             db.session.flush()
-            _create_tasks_for_work_order(work_order, categories)
+            _create_tasks_for_work_order(work_order, matrix)
 
 
-def _create_tasks_for_work_order(work_order: WorkOrder, categories: Sequence[RiskMatrixCategory]) -> None:
+def _create_tasks_for_work_order(work_order: WorkOrder, matrix: RiskMatrix) -> None:
     """Create realistic tasks based on work order type."""
     
     task_templates = {
@@ -150,19 +190,20 @@ def _create_tasks_for_work_order(work_order: WorkOrder, categories: Sequence[Ris
             severity=3     # Default moderate severity
         )
         db.session.add(task)
-        task.update_risk(categories)
+        task.update_risk(matrix)
         task.residual_likelihood = 2
         task.residual_severity = 2
-        task.update_risk(categories, residual=True)
+        task.update_risk(matrix, residual=True)
 
 
 def import_method_statement(
     work_order: WorkOrder,
     csv_path: Path,
-    categories: Sequence[RiskMatrixCategory] | None = None,
+    matrix: RiskMatrix | None = None,
 ) -> MethodStatement:
     """Import a method statement CSV into the database and attach to the work order."""
-    categories = list(categories or load_risk_categories())
+    matrix = matrix or load_risk_matrix()
+    matcher = HazardMatcher.from_catalog()
 
     method_statement = MethodStatement(
         work_order=work_order,
@@ -186,34 +227,228 @@ def import_method_statement(
             )
             db.session.add(task)
 
-            default_likelihood, default_severity = _defaults_from_catalog(row.get("Hazard Description"))
+            default_likelihood, default_severity = matcher.defaults_for(row.get("Hazard Description"))
             task.likelihood = default_likelihood
             task.severity = default_severity
-            task.update_risk(categories)
+            task.update_risk(matrix)
             task.residual_likelihood = max(default_likelihood - 1, 1)
             task.residual_severity = max(default_severity - 1, 1)
-            task.update_risk(categories, residual=True)
+            task.update_risk(matrix, residual=True)
     return method_statement
 
 
+def bulk_import_method_statement(
+    work_order: WorkOrder,
+    csv_path: Path,
+    matrix: RiskMatrix | None = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Import a large method statement CSV in committed chunks.
+
+    Rows are read ``chunk_size`` at a time, scored in one pass per chunk and written
+    with a single executemany ``INSERT`` that bypasses the unit of work, so memory
+    stays bounded by the chunk. Each chunk is committed on its own: a failure part
+    way through leaves the chunks already written in place. The method statement,
+    and any change already pending in the session such as a :func:`clear_work_order`,
+    is committed with the first chunk. ``progress`` is called with the running row
+    count before each chunk commits, so its writes land in the same transaction.
+    Returns the number of tasks imported.
+    """
+    matrix = matrix or load_risk_matrix()
+    matcher = HazardMatcher.from_catalog()
+
+    method_statement = MethodStatement(
+        work_order=work_order,
+        title=csv_path.stem.replace("_", " ").title(),
+        source_filename=csv_path.name,
+    )
+    db.session.add(method_statement)
+    db.session.flush()
+    work_order_id, method_statement_id = work_order.id, method_statement.id
+
+    imported = 0
+    with csv_path.open("r", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                break
+            values = _score_import_chunk(rows, imported + 1, matrix, matcher)
+            for value in values:
+                value["work_order_id"] = work_order_id
+                value["method_statement_id"] = method_statement_id
+            db.session.execute(insert(Task.__table__), values)
+            heatmap.record_inserted_tasks(values)
+            imported += len(values)
+            if progress is not None:
+                progress(imported)
+            db.session.commit()
+    if not imported:
+        db.session.commit()  # No chunk carried the method statement.
+    return imported
+
+
+def _score_import_chunk(
+    rows: list[dict], first_sequence: int, matrix: RiskMatrix, matcher: HazardMatcher
+) -> list[dict]:
+    """Column values for a chunk of CSV rows, with initial and residual risk applied."""
+    defaults = [matcher.defaults_for(row.get("Hazard Description")) for row in rows]
+    values = []
+    for sequence, row, (likelihood, severity) in zip(count(first_sequence), rows, defaults):
+        residual_likelihood, residual_severity = max(likelihood - 1, 1), max(severity - 1, 1)
+        risk_score = likelihood * severity
+        residual_risk_score = residual_likelihood * residual_severity
+        values.append({
+            "sequence": sequence,
+            "activity": (row.get("Work Activity") or "").strip() or f"Task {sequence}",
+            "hazard_description": (row.get("Hazard Description") or "").strip(),
+            "personnel_at_risk": (row.get("Personnel At Risk") or "").strip(),
+            "existing_controls_summary": (row.get("Existing Controls") or "").strip(),
+            "likelihood": likelihood,
+            "severity": severity,
+            "risk_score": risk_score,
+            "risk_category_id": matrix.category_id_for(risk_score),
+            "residual_likelihood": residual_likelihood,
+            "residual_severity": residual_severity,
+            "residual_risk_score": residual_risk_score,
+            "residual_risk_category_id": matrix.category_id_for(residual_risk_score),
+        })
+    return values
+
+
+def clear_work_order(work_order: WorkOrder) -> None:
+    """Delete every task and method statement of a work order, ahead of a re-import.
+
+    Runs as a handful of set-based ``DELETE``s instead of loading the task graph.
+    The flush hooks never see them, so the heatmap counts and sync tombstones are
+    recorded first.
+    """
+    db.session.flush()
+    heatmap.record_deleted_tasks(work_order.id)
+    sync.record_deleted_tasks(work_order.id)
+    task_ids = select(Task.id).where(Task.work_order_id == work_order.id)
+    db.session.execute(delete(TaskControl).where(TaskControl.task_id.in_(task_ids)))
+    db.session.execute(delete(TaskHazard).where(TaskHazard.task_id.in_(task_ids)))
+    db.session.execute(delete(Task).where(Task.work_order_id == work_order.id))
+    db.session.execute(delete(MethodStatement).where(MethodStatement.work_order_id == work_order.id))
+    db.session.expire(work_order, ["tasks", "method_statements"])
+
+
 def get_work_order_by_number(wo_number: str) -> WorkOrder | None:
     return WorkOrder.query.filter_by(number=wo_number).one_or_none()
 
 
+def get_or_create_work_order(wo_number: str, title: str | None = None) -> WorkOrder:
+    work_order = get_work_order_by_number(wo_number)
+    if work_order is None:
+        work_order = WorkOrder(number=wo_number, title=title or wo_number)
+        db.session.add(work_order)
+        db.session.flush()
+    return work_order
+
+
 def get_tasks_for_work_order(wo_number: str) -> list[Task]:
+    work_order = get_work_order_by_number(wo_number)
+    if work_order is None:
+        return []
+    return load_work_order_tasks(work_order)
+
+
+def load_work_order_tasks(work_order: WorkOrder) -> list[Task]:
+    """Load every task of a work order with the full graph serialized by the API.
+
+    Each relationship is fetched with one ``SELECT ... WHERE id IN (...)``, so the
+    number of statements stays the same regardless of how many tasks, hazard links
+    or control links the work order has.
+    """
+    stmt = (
+        select(Task)
+        .where(Task.work_order_id == work_order.id)
+        .options(*_task_graph_options())
+        .order_by(Task.sequence, Task.id)
+    )
+    return db.session.execute(stmt).scalars().all()
+
+
+def iter_work_order_tasks(work_order: WorkOrder, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Task]:
+    """Yield a work order's tasks in order, ``batch_size`` rows per database round trip.
+
+    Each batch has its graph selectin-loaded, and is expunged from the session once the
+    caller has moved past it, so memory stays bounded by one batch however large the
+    work order is.
+    """
+    stmt = (
+        select(Task)
+        .where(Task.work_order_id == work_order.id)
+        .options(*_task_graph_options())
+        .order_by(Task.sequence, Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.session.execute(stmt)
+    try:
+        for partition in result.scalars().partitions():
+            yield from partition
+            for task in partition:
+                db.session.expunge(task)
+    finally:
+        result.close()
+
+
+def load_work_order_task_page(
+    work_order: WorkOrder,
+    after: int | None = None,
+    after_id: int | None = None,
+    limit: int = TASK_PAGE_SIZE,
+) -> tuple[list[Task], bool]:
+    """Return up to ``limit`` tasks ordered by ``(sequence, id)`` after the given cursor.
+
+    Keyset pagination over ``ix_tasks_work_order_sequence``: each page is an index
+    range scan, however deep into the work order it starts. ``after_id`` breaks ties
+    between tasks sharing a sequence number; without it every task at ``after`` is
+    skipped. The flag tells whether more tasks follow.
+    """
+    stmt = select(Task).where(Task.work_order_id == work_order.id)
+    if after is not None:
+        if after_id is None:
+            stmt = stmt.where(Task.sequence > after)
+        else:
+            stmt = stmt.where(or_(Task.sequence > after, and_(Task.sequence == after, Task.id > after_id)))
+    stmt = stmt.options(*_task_graph_options()).order_by(Task.sequence, Task.id).limit(limit + 1)
+    tasks = db.session.execute(stmt).scalars().all()
+    return tasks[:limit], len(tasks) > limit
+
+
+def next_task_sequence(work_order: WorkOrder) -> int:
+    current = db.session.execute(
+        select(func.max(Task.sequence)).where(Task.work_order_id == work_order.id)
+    ).scalar()
+    return (current or 0) + 1
+
+
+def load_tasks(task_ids: Iterable[int]) -> list[Task]:
+    """Load specific tasks with the same graph as :func:`load_work_order_tasks`."""
     stmt = (
         select(Task)
-        .join(WorkOrder)
-        .options(joinedload(Task.hazards).joinedload(TaskHazard.hazard))
-        .options(joinedload(Task.controls).joinedload(TaskControl.control))
-        .where(WorkOrder.number == wo_number)
-        .order_by(Task.sequence)
+        .where(Task.id.in_(set(task_ids)))
+        .options(*_task_graph_options())
+        .order_by(Task.sequence, Task.id)
+    )
+    return db.session.execute(stmt).scalars().all()
+
+
+def _task_graph_options() -> tuple:
+    return (
+        selectinload(Task.risk_category),
+        selectinload(Task.residual_risk_category),
+        selectinload(Task.controls).selectinload(TaskControl.control),
+        selectinload(Task.hazards).selectinload(TaskHazard.hazard),
+        selectinload(Task.hazards).selectinload(TaskHazard.controls).selectinload(TaskControl.control),
     )
-    return db.session.execute(stmt).unique().scalars().all()
 
 
-def upsert_task(task: Task, data: dict, categories: Sequence[RiskMatrixCategory] | None = None) -> Task:
-    categories = list(categories or load_risk_categories())
+def upsert_task(task: Task, data: dict, matrix: RiskMatrix | None = None) -> Task:
+    matrix = matrix or load_risk_matrix()
     for field in (
         "activity",
         "hazard_description",
@@ -238,12 +473,40 @@ def upsert_task(task: Task, data: dict, categories: Sequence[RiskMatrixCategory]
         raw = data["target_completion_date"]
         task.target_completion_date = date.fromisoformat(raw) if raw else None
 
-    task.update_risk(categories)
-    task.update_risk(categories, residual=True)
+    task.update_risk(matrix)
+    task.update_risk(matrix, residual=True)
     db.session.add(task)
     return task
 
 
+def update_tasks(edits: Iterable[dict], matrix: RiskMatrix | None = None) -> list[Task]:
+    """Apply a batch of ``{"id": ..., "fields": {...}}`` edits through :func:`upsert_task`.
+
+    Edits for the same task are merged in order. Returns the tasks whose columns
+    actually changed; the caller commits the batch as one transaction.
+    """
+    merged: dict[int, dict] = {}
+    for edit in edits:
+        if not isinstance(edit, dict) or not isinstance(edit.get("fields"), dict):
+            raise ValueError("Each edit must be an object with 'id' and 'fields'.")
+        merged.setdefault(int(edit["id"]), {}).update(edit["fields"])
+    if not merged:
+        return []
+
+    tasks = {task.id: task for task in Task.query.filter(Task.id.in_(merged)).all()}
+    missing = set(merged) - set(tasks)
+    if missing:
+        raise LookupError(f"Tasks not found: {', '.join(str(task_id) for task_id in sorted(missing))}")
+
+    matrix = matrix or load_risk_matrix()
+    changed = []
+    for task_id, fields in merged.items():
+        task = upsert_task(tasks[task_id], fields, matrix)
+        if db.session.is_modified(task, include_collections=False):
+            changed.append(task)
+    return changed
+
+
 def replace_task_hazards(task: Task, hazards_payload: Iterable[dict]) -> Task:
     payload_list: list[dict] = []
     for item in hazards_payload:
@@ -310,15 +573,6 @@ def replace_task_controls(task: Task, control_ids: Iterable[int], phase: str) ->
     return task
 
 
-def _defaults_from_catalog(hazard_description: str | None) -> tuple[int, int]:
-    if not hazard_description:
-        return 3, 3
-    hazard = Hazard.query.filter(Hazard.name.ilike(f"%{hazard_description}%")).first()
-    if hazard:
-        return hazard.default_likelihood or 3, hazard.default_severity or 3
-    return 3, 3
-
-
 def _seed_hazards() -> None:
     presets = [
         {"name": "Manual handling", "category": "Manual Handling", "description": "Manual lifting / carrying tasks", "default_severity": 4, "default_likelihood": 3, "requires_parameter": True, "parameter_label": "Load weight (kg)", "parameter_unit": "kg"},
@@ -0,0 +1,186 @@
+"""Delta sync of a work order's tasks for several people editing it at once.
+
+A client holds a *sync token*, a reading of the database clock, and asks for
+what changed since it. A task has changed when its own ``updated_at`` or that of
+one of its hazard or control links is newer than the token; the lookups use
+``ix_tasks_work_order_updated_at`` and the ``updated_at`` indexes on the link
+tables. Deleted rows cannot be found that way, so every ORM flush that deletes
+a task, task hazard or task control writes a ``sync_tombstones`` row for it;
+Core deletes of tasks call :func:`record_deleted_tasks` first.
+
+``updated_at`` is stamped when a transaction writes the row but only becomes
+visible at commit, so each window starts ``SYNC_OVERLAP`` before the token and
+a client may receive the same task twice. Tombstones are kept for
+``TOMBSTONE_RETENTION``; an older token, or one with more than
+``MAX_CHANGED_TASKS`` changes behind it, gets ``reset`` and the client reloads
+the work order instead.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, select, union
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import SyncTombstone, Task, TaskControl, TaskHazard, WorkOrder
+
+SYNC_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=1)
+MAX_CHANGED_TASKS = 500
+
+_RECORD_TYPES = {Task: "tasks", TaskHazard: "task_hazards", TaskControl: "task_controls"}
+_TASK_RECORD = _RECORD_TYPES[Task]
+
+
+@dataclass(frozen=True)
+class Changes:
+    """What a client needs to catch up, and the token for its next request."""
+
+    next_token: str
+    task_ids: set[int] = field(default_factory=set)
+    deleted_task_ids: set[int] = field(default_factory=set)
+    reset: bool = False
+
+
+def changes_since(work_order: WorkOrder, token: str | None) -> Changes:
+    """Ids of ``work_order``'s tasks changed or deleted since ``token``.
+
+    Without a token only the next token is returned. Raises ``ValueError`` for a
+    token that was not issued here.
+    """
+    connection = db.session.connection()
+    # Read the clock first: anything committed while the queries run is picked up next time.
+    now = _database_now(connection)
+    next_token = now.isoformat()
+    if token is None:
+        return Changes(next_token)
+
+    window_start = _parse_token(token, now) - SYNC_OVERLAP
+    if window_start < now - TOMBSTONE_RETENTION:
+        return Changes(next_token, reset=True)
+
+    tasks, hazards, controls = Task.__table__, TaskHazard.__table__, TaskControl.__table__
+    tombstones = SyncTombstone.__table__
+    recent_tombstones = (tombstones.c.work_order_id == work_order.id, tombstones.c.deleted_at >= window_start)
+    # Driven by the updated_at indexes: recent link edits are few, a work order's links may not be.
+    recent_links = union(
+        *(select(links.c.task_id).where(links.c.updated_at >= window_start) for links in (hazards, controls))
+    ).subquery()
+    changed = union(
+        select(tasks.c.id).where(tasks.c.work_order_id == work_order.id, tasks.c.updated_at >= window_start),
+        select(tasks.c.id)
+        .select_from(recent_links.join(tasks, tasks.c.id == recent_links.c.task_id))
+        .where(tasks.c.work_order_id == work_order.id),
+        select(tombstones.c.task_id).where(*recent_tombstones, tombstones.c.record_type != _TASK_RECORD),
+    )
+    deleted = set(
+        connection.execute(
+            select(tombstones.c.task_id).where(*recent_tombstones, tombstones.c.record_type == _TASK_RECORD)
+        ).scalars()
+    )
+    # SQLite reuses the highest rowid: a task created after the delete can carry a tombstoned id.
+    recreated = set(
+        connection.execute(
+            select(tasks.c.id).where(tasks.c.work_order_id == work_order.id, tasks.c.id.in_(deleted))
+        ).scalars()
+    ) if deleted else set()
+    deleted -= recreated
+    task_ids = (set(connection.execute(changed).scalars()) - deleted) | recreated
+    if len(task_ids) > MAX_CHANGED_TASKS:
+        return Changes(next_token, reset=True)
+    return Changes(next_token, task_ids, deleted)
+
+
+def record_deleted_tasks(work_order_id: int, session: Session | None = None) -> None:
+    """Tombstone every task of ``work_order_id`` ahead of a Core ``DELETE`` of them."""
+    session = session or db.session
+    connection = session.connection()
+    tasks, table = Task.__table__, SyncTombstone.__table__
+    connection.execute(
+        insert(table).from_select(
+            ["work_order_id", "task_id", "record_type", "record_id"],
+            select(tasks.c.work_order_id, tasks.c.id, literal(_TASK_RECORD), tasks.c.id).where(
+                tasks.c.work_order_id == work_order_id
+            ),
+        )
+    )
+    _prune_tombstones(connection, {work_order_id})
+
+
+def _parse_token(token: str, now: datetime) -> datetime:
+    try:
+        since = datetime.fromisoformat(token)
+    except ValueError:
+        since = None
+    # Tokens carry an offset exactly when the database clock does.
+    if since is None or (since.tzinfo is None) != (now.tzinfo is None):
+        raise ValueError(f"Invalid sync token: {token}")
+    return since
+
+
+def _database_now(connection: Connection) -> datetime:
+    # The same clock that stamps updated_at and deleted_at.
+    return connection.execute(select(func.now())).scalar_one()
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session: Session, flush_context) -> None:
+    deleted = defaultdict(list)
+    for obj in session.deleted:
+        if type(obj) in _RECORD_TYPES or isinstance(obj, WorkOrder):
+            deleted[type(obj)].append(inspect(obj).dict)
+    if not any(deleted.get(model) for model in _RECORD_TYPES):
+        return
+
+    # Tombstones would outlive neither a deleted work order nor, for links, their deleted task.
+    deleted_work_orders = {values.get("id") for values in deleted[WorkOrder]}
+    deleted_tasks = {values.get("id"): values.get("work_order_id") for values in deleted[Task]}
+    links = [
+        (model, values)
+        for model in (TaskHazard, TaskControl)
+        for values in deleted[model]
+        if values.get("task_id") not in deleted_tasks
+    ]
+
+    connection = session.connection()
+    tasks = Task.__table__
+    link_task_ids = {values.get("task_id") for _, values in links} - {None}
+    work_order_ids = dict(deleted_tasks)
+    if link_task_ids:
+        work_order_ids.update(
+            connection.execute(select(tasks.c.id, tasks.c.work_order_id).where(tasks.c.id.in_(link_task_ids))).all()
+        )
+
+    rows: list[dict[str, Any]] = [
+        _tombstone(work_order_ids, Task, task_id, task_id) for task_id in deleted_tasks
+    ] + [_tombstone(work_order_ids, model, values.get("task_id"), values.get("id")) for model, values in links]
+    rows = [row for row in rows if row["work_order_id"] is not None and row["work_order_id"] not in deleted_work_orders]
+    if not rows:
+        return
+
+    connection.execute(insert(SyncTombstone.__table__), rows)
+    _prune_tombstones(connection, {row["work_order_id"] for row in rows})
+
+
+def _prune_tombstones(connection: Connection, work_order_ids: set[int]) -> None:
+    table = SyncTombstone.__table__
+    connection.execute(
+        delete(table).where(
+            table.c.work_order_id.in_(work_order_ids),
+            table.c.deleted_at < _database_now(connection) - TOMBSTONE_RETENTION,
+        )
+    )
+
+
+def _tombstone(work_order_ids: dict[int, int], model: type, task_id: int, record_id: int) -> dict[str, Any]:
+    return {
+        "work_order_id": work_order_ids.get(task_id),
+        "task_id": task_id,
+        "record_type": _RECORD_TYPES[model],
+        "record_id": record_id,
+    }
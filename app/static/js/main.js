@@ -13,6 +13,9 @@ const state = {
   activeHazardId: null,
   activeControlPhase: null,
   activeRiskContext: null,
+  taskPaging: null,
+  taskSync: null,
+  catalogMatches: { hazards: null, controls: null },
 };
 
 const ControlPhase = {
@@ -52,6 +55,7 @@ const riskSelectedLikelihoodEl = document.getElementById("riskSelectedLikelihood
 const riskSelectedSeverityEl = document.getElementById("riskSelectedSeverity");
 
 const taskTableBody = document.getElementById("taskTableBody");
+const taskTableWrapper = taskTableBody?.closest(".risk-table-wrapper");
 const addTaskBtn = document.getElementById("addTask");
 const loadWorkOrderBtn = document.getElementById("loadWorkOrder");
 const importSampleBtn = document.getElementById("importSample");
@@ -60,30 +64,35 @@ const messageArea = document.getElementById("messageArea");
 
 const likelihoodOptions = [1, 2, 3, 4, 5];
 
+const TASK_EDIT_BATCH_DELAY_MS = 300;
+const IMPORT_POLL_INTERVAL_MS = 750;
+const TASK_PAGE_SIZE = 100;
+const TASK_SCROLL_THRESHOLD_PX = 300;
+const TASK_SYNC_INTERVAL_MS = 5000;
+const CATALOG_SEARCH_DELAY_MS = 200;
+const CATALOG_SEARCH_LIMIT = 50;
+const catalogSearchTimers = {};
+const pendingTaskEdits = new Map();
+let pendingTaskEditsFlush = null;
+
 async function loadInitialData() {
   try {
-    const [controlsResponse, hazardsResponse, riskCategoriesResponse, personnelResponse, workOrdersResponse] = await Promise.all([
-      fetchJSON("/api/catalog/controls"),
-      fetchJSON("/api/catalog/hazards"),
-      fetchJSON("/api/risk-matrix"),
-      fetchJSON("/api/catalog/personnel"),
-      fetchJSON("/api/work-orders"),
-    ]);
-
-    state.controls = controlsResponse.controls || [];
-    state.hazards = hazardsResponse.hazards || [];
-    state.riskCategories = riskCategoriesResponse.risk_categories || [];
-    state.personnel = personnelResponse.personnel || [];
+    const data = await fetchJSON("/api/bootstrap");
+
+    state.controls = data.controls || [];
+    state.hazards = data.hazards || [];
+    state.riskCategories = data.risk_categories || [];
+    state.personnel = data.personnel || [];
     
     // Populate work order dropdown
-    populateWorkOrderDropdown(workOrdersResponse.work_orders || []);
+    populateWorkOrderDropdown(data.work_orders || []);
 
     console.log("Initial data loaded:", {
       controls: state.controls.length,
       hazards: state.hazards.length,
       riskCategories: state.riskCategories.length,
       personnel: state.personnel.length,
-      workOrders: workOrdersResponse.work_orders?.length || 0,
+      workOrders: data.work_orders?.length || 0,
     });
   } catch (error) {
     console.error("Failed to load initial data:", error);
@@ -149,14 +158,17 @@ function attachEventHandlers() {
     taskTableBody.addEventListener("change", handleFieldChange);
     taskTableBody.addEventListener("click", handleTableClick);
   }
+  if (taskTableWrapper) {
+    taskTableWrapper.addEventListener("scroll", handleTaskTableScroll, { passive: true });
+  }
   if (hazardSearchEl) {
-    hazardSearchEl.addEventListener("input", () => renderHazardOptions(hazardSearchEl.value));
+    hazardSearchEl.addEventListener("input", () => scheduleCatalogSearch("hazards"));
   }
   if (hazardModalSaveBtn) {
     hazardModalSaveBtn.addEventListener("click", handleHazardModalSave);
   }
   if (controlSearchEl) {
-    controlSearchEl.addEventListener("input", () => renderControlOptions(controlSearchEl.value));
+    controlSearchEl.addEventListener("input", () => scheduleCatalogSearch("controls"));
   }
   if (controlModalSaveBtn) {
     controlModalSaveBtn.addEventListener("click", handleControlModalSave);
@@ -175,6 +187,31 @@ function attachEventHandlers() {
   document.querySelectorAll('textarea.js-field').forEach(autoResizeTextarea);
 }
 
+function scheduleCatalogSearch(catalog) {
+  clearTimeout(catalogSearchTimers[catalog]);
+  catalogSearchTimers[catalog] = setTimeout(() => runCatalogSearch(catalog), CATALOG_SEARCH_DELAY_MS);
+}
+
+async function runCatalogSearch(catalog) {
+  const searchEl = catalog === "hazards" ? hazardSearchEl : controlSearchEl;
+  const render = catalog === "hazards" ? renderHazardOptions : renderControlOptions;
+  const term = searchEl.value.trim();
+  state.catalogMatches[catalog] = null;
+  if (term) {
+    try {
+      const params = new URLSearchParams({ q: term, limit: CATALOG_SEARCH_LIMIT });
+      const data = await fetchJSON(`/api/catalog/${catalog}/search?${params}`);
+      if (searchEl.value.trim() !== term) {
+        return; // A newer search has been scheduled.
+      }
+      state.catalogMatches[catalog] = data[catalog] ?? [];
+    } catch (error) {
+      console.error("Catalog search failed, filtering locally:", error);
+    }
+  }
+  render(searchEl.value);
+}
+
 function getWorkOrderInputs() {
   const woNumberEl = document.getElementById("woNumber");
   const woTitleEl = document.getElementById("woTitle");
@@ -191,16 +228,239 @@ async function handleLoadWorkOrder() {
     return;
   }
   try {
-    const data = await fetchJSON(`/api/work-orders/${encodeURIComponent(woNumber)}`);
-    state.workOrder = data.work_order;
-    state.tasks = data.tasks ?? [];
-    renderTasks();
+    await loadWorkOrder(woNumber);
     flashMessage(`Loaded work order ${woNumber}.`, "success");
   } catch (error) {
     flashMessage(`Unable to load work order: ${error.message}`, "danger");
   }
 }
 
+async function loadWorkOrder(woNumber) {
+  stopTaskSync();
+  // Taken before the first page, so edits made while paging are synced afterwards.
+  const { next: syncToken } = await fetchTaskChanges(woNumber, null);
+  const data = rehydrateTaskPayload(await fetchTaskPage(woNumber, null));
+  state.workOrder = data.work_order;
+  state.tasks = data.tasks ?? [];
+  state.taskPaging = { woNumber, next: data.next, loading: false };
+  renderTasks();
+  startTaskSync(woNumber, syncToken);
+  await fillTaskTableViewport();
+}
+
+function fetchTaskPage(woNumber, cursor) {
+  const params = new URLSearchParams({ limit: TASK_PAGE_SIZE, format: "normalized" });
+  if (cursor) {
+    params.set("after", cursor.after);
+    params.set("after_id", cursor.after_id);
+  }
+  return fetchJSON(`/api/work-orders/${encodeURIComponent(woNumber)}/tasks?${params}`);
+}
+
+// The normalized format sends hazards and controls by ID; rebuild the full task
+// objects from the response's lookup tables, which reflect catalog edits made
+// since startup, falling back to the catalogs loaded then.
+function rehydrateTaskPayload(data) {
+  if (data.format !== "normalized") {
+    return data;
+  }
+  const hazards = catalogById(state.hazards, data.hazards);
+  const controls = catalogById(state.controls, data.controls);
+  const controlLinks = (links = []) => links.map((link) => ({ ...controls.get(link.id), ...link }));
+  data.tasks = (data.tasks ?? []).map((task) => ({
+    ...task,
+    controls: {
+      existing: (task.controls?.existing ?? []).map((id) => ({ ...controls.get(id) })),
+      additional: (task.controls?.additional ?? []).map((id) => ({ ...controls.get(id) })),
+    },
+    hazards: (task.hazards ?? []).map((link) => ({
+      ...hazards.get(link.id),
+      ...link,
+      controls: {
+        existing: controlLinks(link.controls?.existing),
+        additional: controlLinks(link.controls?.additional),
+      },
+    })),
+  }));
+  return data;
+}
+
+function catalogById(loaded, lookup = {}) {
+  const byId = new Map(loaded.map((entry) => [entry.id, entry]));
+  Object.entries(lookup).forEach(([id, entry]) => byId.set(Number(id), entry));
+  return byId;
+}
+
+// Resolves to whether a page was added. A failed fetch keeps `next`, so the
+// next scroll retries it.
+async function loadNextTaskPage() {
+  const paging = state.taskPaging;
+  if (!paging?.next || paging.loading) {
+    return false;
+  }
+  paging.loading = true;
+  try {
+    const data = rehydrateTaskPayload(await fetchTaskPage(paging.woNumber, paging.next));
+    if (state.taskPaging !== paging) {
+      return false; // Another work order was loaded meanwhile.
+    }
+    paging.next = data.next;
+    (data.tasks ?? []).forEach((task) => {
+      // Tasks added locally since the first page may come back again.
+      if (getTask(task.id)) {
+        mergeTask(task);
+        return;
+      }
+      state.tasks.push(task);
+      renderTaskRows(task);
+    });
+    taskTableBody?.querySelectorAll('textarea.js-field').forEach(autoResizeTextarea);
+    return true;
+  } catch (error) {
+    flashMessage(`Unable to load more tasks: ${error.message}`, "danger");
+    return false;
+  } finally {
+    paging.loading = false;
+  }
+}
+
+async function fillTaskTableViewport() {
+  // Keep fetching until the table overflows its wrapper, so scrolling can take over.
+  while (state.taskPaging?.next && taskTableWrapper && taskTableWrapper.scrollHeight <= taskTableWrapper.clientHeight) {
+    const paging = state.taskPaging;
+    const loaded = await loadNextTaskPage();
+    if (!loaded || state.taskPaging !== paging) {
+      return;
+    }
+  }
+}
+
+function handleTaskTableScroll() {
+  const { scrollTop, clientHeight, scrollHeight } = taskTableWrapper;
+  if (scrollTop + clientHeight >= scrollHeight - TASK_SCROLL_THRESHOLD_PX) {
+    loadNextTaskPage();
+  }
+}
+
+function fetchTaskChanges(woNumber, token) {
+  const params = new URLSearchParams({ format: "normalized" });
+  if (token) {
+    params.set("since", token);
+  }
+  return fetchJSON(`/api/work-orders/${encodeURIComponent(woNumber)}/changes?${params}`);
+}
+
+// Other people's edits arrive as deltas: only the tasks changed or deleted since
+// the last token, patched into the table row by row.
+function startTaskSync(woNumber, token) {
+  stopTaskSync();
+  // `deferred` holds the latest remote version of tasks whose rows were being edited.
+  state.taskSync = { woNumber, token, timer: null, deferred: new Map() };
+  scheduleTaskSync(state.taskSync);
+}
+
+function stopTaskSync() {
+  if (state.taskSync) {
+    clearTimeout(state.taskSync.timer);
+  }
+  state.taskSync = null;
+}
+
+function scheduleTaskSync(sync) {
+  sync.timer = setTimeout(() => syncTaskChanges(sync), TASK_SYNC_INTERVAL_MS);
+}
+
+async function syncTaskChanges(sync) {
+  if (!document.hidden) {
+    try {
+      const data = rehydrateTaskPayload(await fetchTaskChanges(sync.woNumber, sync.token));
+      if (state.taskSync !== sync) {
+        return; // Another work order was loaded meanwhile.
+      }
+      if (data.reset) {
+        await loadWorkOrder(sync.woNumber);
+        return;
+      }
+      applyTaskChanges(data, sync.deferred);
+      sync.token = data.next;
+    } catch (error) {
+      console.error("Task sync failed, retrying:", error);
+    }
+  }
+  if (state.taskSync === sync) {
+    scheduleTaskSync(sync);
+  }
+}
+
+// Rows being edited keep their task in `deferred` until a later poll finds the
+// edit finished.
+function applyTaskChanges(data, deferred) {
+  const hadTasks = state.tasks.length > 0;
+  const deleted = new Set(data.deleted_task_ids ?? []);
+  if (deleted.size) {
+    state.tasks = state.tasks.filter((task) => !deleted.has(task.id));
+    deleted.forEach((taskId) => {
+      pendingTaskEdits.delete(taskId);
+      deferred.delete(taskId);
+      removeTaskRows(taskId);
+    });
+  }
+  (data.tasks ?? []).forEach((task) => deferred.set(task.id, task));
+  deferred.forEach((task, taskId) => {
+    if (isTaskBeingEdited(taskId)) {
+      return;
+    }
+    deferred.delete(taskId);
+    if (!getTask(taskId) && !isWithinLoadedPages(task)) {
+      return; // Paging will fetch it in order.
+    }
+    mergeTask(task);
+    replaceTaskRows(task);
+  });
+  if (hadTasks !== state.tasks.length > 0) {
+    renderTasks();
+  }
+}
+
+function isTaskBeingEdited(taskId) {
+  const focusedRow = document.activeElement?.closest?.("tr[data-task-id]");
+  return pendingTaskEdits.has(taskId) || Number(focusedRow?.dataset.taskId) === taskId;
+}
+
+function isWithinLoadedPages(task) {
+  const next = state.taskPaging?.next;
+  return !next || task.sequence < next.after || (task.sequence === next.after && task.id <= next.after_id);
+}
+
+function removeTaskRows(taskId) {
+  taskTableBody?.querySelectorAll(`tr[data-task-id="${taskId}"]`).forEach((row) => row.remove());
+}
+
+function replaceTaskRows(task) {
+  if (!taskTableBody) {
+    return;
+  }
+  removeTaskRows(task.id);
+  const rows = document.createDocumentFragment();
+  renderTaskRows(task, rows);
+  const textareas = rows.querySelectorAll("textarea.js-field");
+  taskTableBody.insertBefore(rows, firstRowAfter(task));
+  textareas.forEach(autoResizeTextarea);
+}
+
+// The first rendered row of the task that follows `task` in (sequence, id) order,
+// the order of the server's pages.
+function firstRowAfter(task) {
+  const following = state.tasks.reduce((best, other) => {
+    return compareTaskOrder(other, task) > 0 && (!best || compareTaskOrder(other, best) < 0) ? other : best;
+  }, null);
+  return following ? taskTableBody.querySelector(`tr[data-task-id="${following.id}"]`) : null;
+}
+
+function compareTaskOrder(a, b) {
+  return (a.sequence ?? 0) - (b.sequence ?? 0) || a.id - b.id;
+}
+
 async function handleImportSample() {
   const { woNumber, title } = getWorkOrderInputs();
   if (!woNumber) {
@@ -213,9 +473,8 @@ async function handleImportSample() {
       method: "POST",
       body: JSON.stringify(payload),
     });
-    state.workOrder = data.work_order;
-    state.tasks = data.tasks ?? [];
-    renderTasks();
+    await waitForImportJob(data.job);
+    await loadWorkOrder(woNumber);
     flashMessage(`Imported sample MS into ${woNumber}.`, "success");
   } catch (error) {
     flashMessage(`Import failed: ${error.message}`, "danger");
@@ -250,16 +509,58 @@ async function handleImportUploaded() {
       throw new Error(await response.text());
     }
     const data = await response.json();
-    state.workOrder = data.work_order;
-    state.tasks = data.tasks ?? [];
-    renderTasks();
     fileInput.value = "";
+    await waitForImportJob(data.job);
+    await loadWorkOrder(woNumber);
     flashMessage(`Imported ${file.name} into ${woNumber}.`, "success");
   } catch (error) {
     flashMessage(`Upload failed: ${error.message}`, "danger");
   }
 }
 
+async function waitForImportJob(job) {
+  const progress = showImportProgress();
+  try {
+    let current = job;
+    progress.update(current);
+    while (current.status === "queued" || current.status === "running") {
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+      current = (await fetchJSON(`/api/import-jobs/${current.id}`)).job;
+      progress.update(current);
+    }
+    if (current.status === "failed") {
+      throw new Error(current.error || "Import job failed");
+    }
+    return current;
+  } finally {
+    progress.remove();
+  }
+}
+
+function showImportProgress() {
+  const wrapper = document.createElement("div");
+  wrapper.className = "alert alert-info";
+  wrapper.innerHTML = `
+    <div class="small mb-1 js-import-label">Import queued...</div>
+    <div class="progress" role="progressbar">
+      <div class="progress-bar progress-bar-striped progress-bar-animated" style="width: 0%"></div>
+    </div>
+  `;
+  messageArea?.appendChild(wrapper);
+  const bar = wrapper.querySelector(".progress-bar");
+  const label = wrapper.querySelector(".js-import-label");
+  return {
+    update(job) {
+      const percent = job.total_rows ? Math.min(100, Math.round((job.rows_processed / job.total_rows) * 100)) : 0;
+      bar.style.width = `${percent}%`;
+      label.textContent = `Importing ${job.source_filename}: ${job.rows_processed} / ${job.total_rows ?? "?"} rows`;
+    },
+    remove() {
+      wrapper.remove();
+    },
+  };
+}
+
 async function handleAddTask() {
   if (!state.workOrder) {
     flashMessage("Load or import a work order first.", "warning");
@@ -276,8 +577,10 @@ async function handleAddTask() {
       severity: 1,
       residual_likelihood: 1,
       residual_severity: 1,
-      sequence: state.tasks.length + 1,
     };
+    if (!state.taskPaging?.next) {
+      payload.sequence = state.tasks.length + 1;
+    }
     const data = await fetchJSON("/api/tasks", {
       method: "POST",
       body: JSON.stringify(payload),
@@ -356,13 +659,31 @@ function handleTableClick(event) {
   }
 }
 
-async function updateTask(taskId, payload) {
+function updateTask(taskId, payload) {
+  // Edits made within a short window are merged per task and sent as one batch.
+  pendingTaskEdits.set(taskId, { ...(pendingTaskEdits.get(taskId) || {}), ...payload });
+  if (!pendingTaskEditsFlush) {
+    pendingTaskEditsFlush = new Promise((resolve) => {
+      setTimeout(() => flushTaskEdits().then(resolve), TASK_EDIT_BATCH_DELAY_MS);
+    });
+  }
+  return pendingTaskEditsFlush;
+}
+
+async function flushTaskEdits() {
+  const edits = Array.from(pendingTaskEdits, ([id, fields]) => ({ id, fields }));
+  pendingTaskEdits.clear();
+  pendingTaskEditsFlush = null;
   try {
-    const data = await fetchJSON(`/api/tasks/${taskId}`, {
-      method: "PUT",
-      body: JSON.stringify(payload),
+    const data = await fetchJSON("/api/tasks", {
+      method: "PATCH",
+      body: JSON.stringify({ edits }),
+    });
+    (data.tasks ?? []).forEach((task) => {
+      // The saved task already includes any remote change deferred while it was edited.
+      state.taskSync?.deferred.delete(task.id);
+      mergeTask(task);
     });
-    mergeTask(data.task);
     renderTasks();
   } catch (error) {
     flashMessage(`Update failed: ${error.message}`, "danger");
@@ -403,7 +724,7 @@ function renderTasks() {
   addTaskBtn?.removeAttribute("disabled");
   state.tasks
     .slice()
-    .sort((a, b) => (a.sequence ?? 0) - (b.sequence ?? 0))
+    .sort(compareTaskOrder)
     .forEach((task) => {
       renderTaskRows(task);
     });
@@ -414,13 +735,13 @@ function renderTasks() {
   }, 0);
 }
 
-function renderTaskRows(task) {
+function renderTaskRows(task, container = taskTableBody) {
   if (!task.hazards || task.hazards.length === 0) {
     // Task with no hazards - single row
     const row = document.createElement("tr");
     row.dataset.taskId = task.id;
     row.innerHTML = renderTaskRowWithoutHazards(task);
-    taskTableBody.appendChild(row);
+    container.appendChild(row);
   } else {
     // Task with hazards - multiple rows
     task.hazards.forEach((hazard, index) => {
@@ -428,7 +749,7 @@ function renderTaskRows(task) {
       row.dataset.taskId = task.id;
       row.dataset.hazardId = hazard.id;
       row.innerHTML = renderTaskRowWithHazard(task, hazard, index);
-      taskTableBody.appendChild(row);
+      container.appendChild(row);
     });
   }
 }
@@ -969,6 +1290,7 @@ function openHazardModal(taskId) {
     currentHazards.map((hazard) => [hazard.id, { id: hazard.id, parameter_value: hazard.parameter_value || "" }]),
   );
   hazardSearchEl.value = "";
+  state.catalogMatches.hazards = null;
   renderSelectedHazards();
   renderHazardOptions("");
   hazardModal?.show();
@@ -1031,10 +1353,12 @@ function renderHazardOptions(filter = "") {
   
   hazardOptionsEl.innerHTML = "";
   
-  // Filter hazards based on search term
-  const filteredHazards = state.hazards.filter((hazard) =>
-    !term || hazard.name.toLowerCase().includes(term) || hazard.category.toLowerCase().includes(term)
-  );
+  // Filter hazards based on search term, preferring ranked server-side matches
+  const filteredHazards = term && state.catalogMatches.hazards
+    ? state.catalogMatches.hazards
+    : state.hazards.filter((hazard) =>
+      !term || hazard.name.toLowerCase().includes(term) || hazard.category.toLowerCase().includes(term)
+    );
 
   if (filteredHazards.length === 0) {
     hazardOptionsEl.innerHTML = '<div class="text-muted text-center py-3">No hazards found</div>';
@@ -1158,6 +1482,7 @@ function openControlModal(taskId, phase = ControlPhase.EXISTING, hazardId = null
   
   state.controlSelection = new Set(selected.map((control) => control.id));
   controlSearchEl.value = "";
+  state.catalogMatches.controls = null;
   controlModalTitleEl.textContent = phase === ControlPhase.EXISTING ? "Select Existing Controls" : "Select Additional Controls";
   controlPhaseLabelEl.textContent = phase === ControlPhase.EXISTING ? "Current" : "Planned";
   renderSelectedControls();
@@ -1394,10 +1719,12 @@ function renderControlOptions(filter = "") {
   const term = filter.toLowerCase();
   controlOptionsEl.innerHTML = "";
   
-  // Filter controls based on search term
-  const filteredControls = state.controls.filter((control) =>
-    !term || control.name.toLowerCase().includes(term) || control.category.toLowerCase().includes(term)
-  );
+  // Filter controls based on search term, preferring ranked server-side matches
+  const filteredControls = term && state.catalogMatches.controls
+    ? state.catalogMatches.controls
+    : state.controls.filter((control) =>
+      !term || control.name.toLowerCase().includes(term) || control.category.toLowerCase().includes(term)
+    );
   
   // Group existing categories into hierarchy
   const categoryMapping = {
@@ -0,0 +1,151 @@
+"""Fixtures for the service-layer and API benchmarks.
+
+Every benchmark runs against ``TestingConfig`` pointed at a file-backed SQLite
+database, once per task scale (``--scales``, default 10, 1000 and 10000). The
+datasets come from the synthetic generator behind ``flask risk generate``, built
+once per scale, so setup stays fast even at 10k tasks.
+"""
+from __future__ import annotations
+
+import csv
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, select
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app import create_app  # noqa: E402
+from app.config import TestingConfig  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import (  # noqa: E402
+    ControlMeasure,
+    Hazard,
+    MethodStatement,
+    RiskHeatmapCell,
+    SyncTombstone,
+    Task,
+    TaskControl,
+    TaskHazard,
+    WorkOrder,
+)
+from app.risk import services  # noqa: E402
+from app.risk.generate import generate_dataset  # noqa: E402
+
+DEFAULT_SCALES = "10,1000,10000"
+
+HAZARD_DESCRIPTIONS = [
+    "Live electrical conductors",
+    "Manual handling - 35kg casing",
+    "Stored energy release",
+    "Chemical exposure - corrosive",
+    "Working at height >2m",
+    "Hot surfaces",
+]
+
+HAZARDS_PER_TASK = 2
+CATALOG_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Dataset:
+    scale: int
+    work_order_number: str
+    csv_path: Path
+    hazard_ids: list[int]
+    control_ids: list[int]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--scales",
+        default=DEFAULT_SCALES,
+        help=f"comma-separated task counts to benchmark (default: {DEFAULT_SCALES})",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        scales = [int(value) for value in metafunc.config.getoption("scales").split(",") if value.strip()]
+        metafunc.parametrize("scale", scales, ids=lambda scale: f"{scale}-tasks", scope="session")
+
+
+def rounds_for(scale: int) -> int:
+    """Enough rounds for stable numbers at small scales without minutes per test at 10k."""
+    return max(2, min(20, 20_000 // scale))
+
+
+def write_method_statement(path: Path, rows: int) -> Path:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Task Number", "Work Activity", "Personnel At Risk", "Hazard Description", "Existing Controls"])
+        for idx in range(1, rows + 1):
+            writer.writerow([
+                idx,
+                f"Activity step {idx}",
+                "Maintenance crew",
+                HAZARD_DESCRIPTIONS[idx % len(HAZARD_DESCRIPTIONS)],
+                "Permit to work; Job safety briefing",
+            ])
+    return path
+
+
+def remove_work_order(number: str) -> None:
+    """Delete a benchmark work order and its graph without loading it into the session."""
+    work_order_id = db.session.execute(select(WorkOrder.id).where(WorkOrder.number == number)).scalar()
+    if work_order_id is None:
+        return
+    task_ids = select(Task.id).where(Task.work_order_id == work_order_id)
+    db.session.execute(delete(TaskControl).where(TaskControl.task_id.in_(task_ids)))
+    db.session.execute(delete(TaskHazard).where(TaskHazard.task_id.in_(task_ids)))
+    db.session.execute(delete(Task).where(Task.work_order_id == work_order_id))
+    db.session.execute(delete(RiskHeatmapCell).where(RiskHeatmapCell.work_order_id == work_order_id))
+    db.session.execute(delete(SyncTombstone).where(SyncTombstone.work_order_id == work_order_id))
+    db.session.execute(delete(MethodStatement).where(MethodStatement.work_order_id == work_order_id))
+    # Through the ORM so the work order catalog stamp moves.
+    db.session.delete(db.session.get(WorkOrder, work_order_id))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    database_path = tmp_path_factory.mktemp("db") / "benchmark.sqlite"
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        services.bootstrap_seed_data()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture(scope="session")
+def matrix(app):
+    return services.load_risk_matrix()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def dataset(app, scale, matrix, tmp_path_factory):
+    """A work order of ``scale`` synthetic tasks, each with hazards that carry controls."""
+    csv_path = write_method_statement(tmp_path_factory.mktemp("csv") / f"statement_{scale}.csv", scale)
+    prefix = f"BENCH{scale}"
+    generate_dataset(1, scale, HAZARDS_PER_TASK, CATALOG_SIZE, matrix, seed=scale, prefix=prefix)
+    db.session.expunge_all()
+
+    hazard_ids = db.session.execute(select(Hazard.id).order_by(Hazard.id)).scalars().all()
+    control_ids = db.session.execute(select(ControlMeasure.id).order_by(ControlMeasure.id)).scalars().all()
+    number = f"{prefix}-000001"
+    yield Dataset(scale, number, csv_path, hazard_ids, control_ids)
+    remove_work_order(number)
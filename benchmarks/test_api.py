@@ -0,0 +1,37 @@
+"""API benchmarks: the JSON endpoints the risk table loads a work order through."""
+from __future__ import annotations
+
+from conftest import rounds_for
+
+
+def test_get_work_order(benchmark, client, dataset):
+    benchmark.group = "GET /api/work-orders/<wo>"
+
+    def run():
+        response = client.get(f"/api/work-orders/{dataset.work_order_number}")
+        assert response.status_code == 200
+        return response
+
+    benchmark.pedantic(run, rounds=rounds_for(dataset.scale))
+
+
+def test_stream_work_order(benchmark, client, dataset):
+    benchmark.group = "GET /api/work-orders/<wo>?stream=1"
+
+    def run():
+        response = client.get(f"/api/work-orders/{dataset.work_order_number}?stream=1")
+        assert response.status_code == 200
+        return response.get_data()
+
+    benchmark.pedantic(run, rounds=rounds_for(dataset.scale))
+
+
+def test_first_task_page(benchmark, client, dataset):
+    benchmark.group = "GET /api/work-orders/<wo>/tasks"
+
+    def run():
+        response = client.get(f"/api/work-orders/{dataset.work_order_number}/tasks")
+        assert response.status_code == 200
+        return response
+
+    benchmark.pedantic(run, rounds=rounds_for(dataset.scale))
@@ -0,0 +1,184 @@
+"""Service-layer benchmarks, one per scale.
+
+Each timed round operates on every task of the scale's work order and commits,
+so the numbers include the flush. Setup work (loading rows to mutate, resetting
+state) happens in ``pedantic`` setup callbacks and is not timed.
+"""
+from __future__ import annotations
+
+from itertools import count
+
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+
+from app.extensions import db
+from app.models import ControlPhase, ImportJob, ImportStatus, Task, TaskHazard, WorkOrder
+from app.risk import jobs, services
+from app.risk.generate import generate_dataset
+from app.risk.routes import task_to_dict
+
+from conftest import CATALOG_SIZE, HAZARDS_PER_TASK, remove_work_order, rounds_for, write_method_statement
+
+
+def _work_order_tasks(dataset, *options):
+    work_order = services.get_work_order_by_number(dataset.work_order_number)
+    return Task.query.filter_by(work_order_id=work_order.id).options(*options).order_by(Task.sequence).all()
+
+
+def test_import_method_statement(benchmark, dataset, matrix):
+    benchmark.group = "import_method_statement"
+    numbers = count(1)
+    current = []
+
+    def setup():
+        if current:
+            remove_work_order(current.pop())
+        number = f"IMPORT-{dataset.scale}-{next(numbers)}"
+        work_order = WorkOrder(number=number, title="Import benchmark")
+        db.session.add(work_order)
+        db.session.commit()
+        current.append(number)
+        return (work_order,), {}
+
+    def run(work_order):
+        services.import_method_statement(work_order, dataset.csv_path, matrix)
+        db.session.commit()
+
+    benchmark.pedantic(run, setup=setup, rounds=rounds_for(dataset.scale))
+    remove_work_order(current.pop())
+
+
+def test_load_and_serialize_work_order(benchmark, dataset):
+    benchmark.group = "get_tasks_for_work_order+task_to_dict"
+
+    def setup():
+        db.session.expunge_all()
+        return (), {}
+
+    def run():
+        return [task_to_dict(task) for task in services.get_tasks_for_work_order(dataset.work_order_number)]
+
+    payload = benchmark.pedantic(run, setup=setup, rounds=rounds_for(dataset.scale))
+    assert len(payload) == dataset.scale
+
+
+def test_load_work_order_query_count_is_flat(app, matrix):
+    """Loading and serializing a work order takes as many statements at 50 tasks as at 5."""
+    numbers = []
+    for tasks in (5, 50):
+        prefix = f"QUERYCOUNT{tasks}"
+        generate_dataset(1, tasks, HAZARDS_PER_TASK, CATALOG_SIZE, matrix, seed=tasks, prefix=prefix)
+        numbers.append(f"{prefix}-000001")
+
+    def statements_for(number):
+        db.session.expunge_all()
+        work_order = services.get_work_order_by_number(number)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            payload = [task_to_dict(task) for task in services.load_work_order_tasks(work_order)]
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert payload and all(task["hazards"] for task in payload)
+        return len(statements)
+
+    try:
+        small, large = (statements_for(number) for number in numbers)
+        assert small == large
+    finally:
+        for number in numbers:
+            remove_work_order(number)
+
+
+def test_failed_replace_import_keeps_tasks(app, matrix, monkeypatch, tmp_path):
+    """A replacing import that fails before its first chunk commits leaves the old tasks in place."""
+    generate_dataset(1, 2, HAZARDS_PER_TASK, CATALOG_SIZE, matrix, prefix="FAILEDIMPORT")
+    number = "FAILEDIMPORT-000001"
+    work_order = services.get_work_order_by_number(number)
+    job = ImportJob(work_order=work_order, source_filename="statement.csv", replace_existing=True,
+                    status=ImportStatus.QUEUED, total_rows=5)
+    db.session.add(job)
+    db.session.commit()
+    work_order_id, job_id = work_order.id, job.id
+
+    def fail(*args, **kwargs):
+        raise ValueError("scoring failed")
+
+    monkeypatch.setattr(services, "_score_import_chunk", fail)
+    try:
+        jobs._run_import(app, job_id, write_method_statement(tmp_path / "statement.csv", 5))
+        db.session.expunge_all()
+        assert db.session.get(ImportJob, job_id).status == ImportStatus.FAILED
+        assert Task.query.filter_by(work_order_id=work_order_id).count() == 2
+    finally:
+        remove_work_order(number)
+
+
+def test_upsert_task(benchmark, dataset, matrix):
+    benchmark.group = "upsert_task"
+    rounds = count()
+
+    def setup():
+        db.session.expunge_all()
+        return (_work_order_tasks(dataset), next(rounds)), {}
+
+    def run(tasks, round_number):
+        # Alternate between two scorings so every round actually writes.
+        likelihood = 2 + round_number % 2
+        for task in tasks:
+            services.upsert_task(
+                task,
+                {"likelihood": likelihood, "severity": 4, "residual_likelihood": 1, "residual_severity": 2},
+                matrix,
+            )
+        db.session.commit()
+
+    benchmark.pedantic(run, setup=setup, rounds=rounds_for(dataset.scale))
+
+
+def test_replace_task_hazards(benchmark, dataset):
+    benchmark.group = "replace_task_hazards"
+    rounds = count()
+    first, second, third = dataset.hazard_ids[-3:]
+
+    def setup():
+        db.session.expunge_all()
+        return (_work_order_tasks(dataset, selectinload(Task.hazards)), next(rounds)), {}
+
+    def run(tasks, round_number):
+        # Each round keeps one hazard link, drops one and adds one.
+        payload = [{"id": first}, {"id": second}] if round_number % 2 else [{"id": first}, {"id": third}]
+        for task in tasks:
+            services.replace_task_hazards(task, payload)
+        db.session.commit()
+
+    benchmark.pedantic(run, setup=setup, rounds=rounds_for(dataset.scale))
+
+
+def test_replace_hazard_controls(benchmark, dataset):
+    benchmark.group = "replace_hazard_controls"
+    rounds = count()
+    first, second, third = dataset.control_ids[-3:]
+
+    def setup():
+        db.session.expunge_all()
+        work_order = services.get_work_order_by_number(dataset.work_order_number)
+        task_hazards = (
+            TaskHazard.query.join(Task)
+            .filter(Task.work_order_id == work_order.id)
+            .options(selectinload(TaskHazard.controls), selectinload(TaskHazard.task))
+            .all()
+        )
+        return (task_hazards, next(rounds)), {}
+
+    def run(task_hazards, round_number):
+        control_ids = [first, second] if round_number % 2 else [first, third]
+        for task_hazard in task_hazards:
+            services.replace_hazard_controls(task_hazard, control_ids, ControlPhase.ADDITIONAL)
+        db.session.commit()
+
+    benchmark.pedantic(run, setup=setup, rounds=rounds_for(dataset.scale))
@@ -0,0 +1,23 @@
+"""Gunicorn settings, picked up automatically when gunicorn starts from the repo root."""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# prometheus_client writes each worker's samples here so /metrics can aggregate
+# all of them. It must be set before the workers import the app.
+metrics_dir = Path(
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(Path(tempfile.gettempdir()) / "rca-prometheus"))
+)
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be summed into the new one.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,52 @@
+"""Add indexes on foreign keys and the (work_order_id, sequence) task order
+
+Revision ID: 3f1c2a7d9b10
+Revises: 
+Create Date: 2026-10-16 21:00:00.000000
+
+Databases created before this revision were built with ``db.create_all()`` and
+never stamped, while newer ones already get these indexes from the models, so
+each index is only created when it is missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7d9b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_method_statements_work_order_id', 'method_statements', ['work_order_id']),
+    ('ix_tasks_work_order_sequence', 'tasks', ['work_order_id', 'sequence', 'id']),
+    ('ix_tasks_method_statement_id', 'tasks', ['method_statement_id']),
+    ('ix_task_hazards_hazard_id', 'task_hazards', ['hazard_id']),
+    ('ix_task_controls_task_id', 'task_controls', ['task_id']),
+    ('ix_task_controls_control_id', 'task_controls', ['control_id']),
+    ('ix_import_jobs_work_order_id', 'import_jobs', ['work_order_id']),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(inspector, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,66 @@
+"""Add sync_tombstones and the updated_at indexes behind work order delta sync
+
+Revision ID: 5d2e9a7c4b18
+Revises: 8c4e1b2f6a31
+Create Date: 2026-10-17 01:00:00.000000
+
+``db.create_all()`` may already have created the table and indexes, so each is
+only created when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e9a7c4b18'
+down_revision = '8c4e1b2f6a31'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_tasks_work_order_updated_at', 'tasks', ['work_order_id', 'updated_at']),
+    ('ix_task_hazards_updated_at', 'task_hazards', ['updated_at']),
+    ('ix_task_controls_updated_at', 'task_controls', ['updated_at']),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tasks'):
+        return
+    if not inspector.has_table('sync_tombstones'):
+        op.create_table(
+            'sync_tombstones',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('work_order_id', sa.Integer(), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('record_type', sa.String(length=32), nullable=False),
+            sa.Column('record_id', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.ForeignKeyConstraint(['work_order_id'], ['work_orders.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(
+            'ix_sync_tombstones_work_order_deleted_at', 'sync_tombstones', ['work_order_id', 'deleted_at']
+        )
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(inspector, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
+    if inspector.has_table('sync_tombstones'):
+        op.drop_table('sync_tombstones')
@@ -0,0 +1,56 @@
+"""Add the risk_heatmap_cells summary table and fill it from existing tasks
+
+Revision ID: 8c4e1b2f6a31
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-16 23:00:00.000000
+
+``db.create_all()`` may already have created the table empty, so it is only
+created when missing and its counts are always recomputed from ``tasks``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e1b2f6a31'
+down_revision = '3f1c2a7d9b10'
+branch_labels = None
+depends_on = None
+
+
+PHASE_COLUMNS = {
+    'initial': ('likelihood', 'severity'),
+    'residual': ('residual_likelihood', 'residual_severity'),
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tasks'):
+        return
+    if not inspector.has_table('risk_heatmap_cells'):
+        op.create_table(
+            'risk_heatmap_cells',
+            sa.Column('work_order_id', sa.Integer(), nullable=False),
+            sa.Column('phase', sa.Enum('initial', 'residual', name='risk_phase'), nullable=False),
+            sa.Column('likelihood', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('severity', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('task_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['work_order_id'], ['work_orders.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('work_order_id', 'phase', 'likelihood', 'severity'),
+        )
+
+    op.execute('DELETE FROM risk_heatmap_cells')
+    for phase, (likelihood, severity) in PHASE_COLUMNS.items():
+        op.execute(
+            'INSERT INTO risk_heatmap_cells (work_order_id, phase, likelihood, severity, task_count) '
+            f"SELECT work_order_id, '{phase}', COALESCE({likelihood}, 1), COALESCE({severity}, 1), COUNT(*) "
+            f'FROM tasks GROUP BY work_order_id, COALESCE({likelihood}, 1), COALESCE({severity}, 1)'
+        )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('risk_heatmap_cells'):
+        op.drop_table('risk_heatmap_cells')
+        sa.Enum(name='risk_phase').drop(op.get_bind(), checkfirst=True)
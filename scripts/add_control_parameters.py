@@ -10,6 +10,8 @@ from pathlib import Path
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
 
+from sqlalchemy import inspect
+
 from app import create_app
 from app.extensions import db
 
@@ -21,18 +23,17 @@ def add_control_parameter_fields():
         try:
             with db.engine.connect() as conn:
                 # Check current table structure
-                result = conn.execute(db.text("PRAGMA table_info(control_measures)"))
-                columns = result.fetchall()
-                existing_columns = [col[1] for col in columns]
+                columns = inspect(conn).get_columns("control_measures")
+                existing_columns = [col['name'] for col in columns]
                 
                 print("Current control_measures table structure:")
                 for col in columns:
-                    print(f"  {col}")
+                    print(f"  {col['name']} {col['type']} nullable={col['nullable']}")
                 
                 # Add requires_parameter column if it doesn't exist
                 if 'requires_parameter' not in existing_columns:
                     print("Adding requires_parameter column...")
-                    conn.execute(db.text("ALTER TABLE control_measures ADD COLUMN requires_parameter BOOLEAN NOT NULL DEFAULT 0"))
+                    conn.execute(db.text("ALTER TABLE control_measures ADD COLUMN requires_parameter BOOLEAN NOT NULL DEFAULT FALSE"))
                     conn.commit()
                 
                 # Add parameter_label column if it doesn't exist
@@ -56,19 +57,18 @@ def add_control_parameter_fields():
                     # Set requires_parameter to True and use reference as parameter_label
                     conn.execute(db.text("""
                         UPDATE control_measures 
-                        SET requires_parameter = 1, parameter_label = ? 
-                        WHERE id = ?
-                    """), (reference, control_id))
+                        SET requires_parameter = TRUE, parameter_label = :label 
+                        WHERE id = :id
+                    """), {"label": reference, "id": control_id})
                 
                 conn.commit()
                 print(f"Migrated {len(controls_with_references)} controls with references to parameter system")
                 
                 # Verify the changes
-                result = conn.execute(db.text("PRAGMA table_info(control_measures)"))
-                new_columns = result.fetchall()
+                new_columns = inspect(conn).get_columns("control_measures")
                 print("\nUpdated control_measures table structure:")
                 for col in new_columns:
-                    print(f"  {col}")
+                    print(f"  {col['name']} {col['type']} nullable={col['nullable']}")
                 
                 print("Control parameter fields added successfully!")
                 return True
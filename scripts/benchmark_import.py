@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare method statement import throughput: ORM path vs bulk chunked path.
+
+Usage: python scripts/benchmark_import.py [--rows 50000] [--chunk-size 1000]
+"""
+
+import argparse
+import csv
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the app directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import WorkOrder
+from app.risk import services
+
+HAZARD_DESCRIPTIONS = [
+    "Live electrical conductors",
+    "Manual handling - 35kg casing",
+    "Stored energy release",
+    "Chemical exposure - corrosive",
+    "Working at height >2m",
+    "Hot surfaces",
+]
+
+
+def write_csv(path, rows):
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Task Number", "Work Activity", "Personnel At Risk", "Hazard Description", "Existing Controls"])
+        for idx in range(1, rows + 1):
+            writer.writerow([
+                idx,
+                f"Activity step {idx}",
+                "Maintenance crew",
+                HAZARD_DESCRIPTIONS[idx % len(HAZARD_DESCRIPTIONS)],
+                "Permit to work; Job safety briefing",
+            ])
+
+
+def run(label, import_fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    imported = import_fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<5} {imported:>8} rows  {elapsed:8.2f}s  {imported / elapsed:10.0f} rows/s  peak {peak / 1_048_576:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=services.IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        csv_path = tmp_path / "benchmark_statement.csv"
+        write_csv(csv_path, args.rows)
+
+        class BenchmarkConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'benchmark.sqlite'}"
+
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            db.create_all()
+            services.bootstrap_seed_data()
+            matrix = services.load_risk_matrix()
+
+            orm_wo = WorkOrder(number="BENCH-ORM", title="ORM import")
+            bulk_wo = WorkOrder(number="BENCH-BULK", title="Bulk import")
+            db.session.add_all([orm_wo, bulk_wo])
+            db.session.commit()
+
+            def orm_import():
+                services.import_method_statement(orm_wo, csv_path, matrix)
+                db.session.commit()
+                return args.rows
+
+            print(f"Importing {args.rows} rows (chunk size {args.chunk_size})")
+            run("orm", orm_import)
+            run("bulk", lambda: services.bulk_import_method_statement(bulk_wo, csv_path, matrix, args.chunk_size))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
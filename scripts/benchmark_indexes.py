@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Time the foreign-key lookups behind work order loads and deletes, without and with the indexes.
+
+Usage: python scripts/benchmark_indexes.py [--work-orders 200] [--tasks 50] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from sqlalchemy import insert, select, text
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import ControlMeasure, ControlPhase, Hazard, MethodStatement, Task, TaskControl, TaskHazard, WorkOrder
+from app.risk import services
+
+FOREIGN_KEY_INDEXES = [
+    "ix_method_statements_work_order_id",
+    "ix_tasks_work_order_sequence",
+    "ix_tasks_method_statement_id",
+    "ix_task_hazards_hazard_id",
+    "ix_task_controls_task_id",
+    "ix_task_controls_control_id",
+]
+
+
+def populate(work_orders, tasks_per_order, seed=7):
+    rng = random.Random(seed)
+    hazard_ids = db.session.execute(select(Hazard.id)).scalars().all()
+    control_ids = db.session.execute(select(ControlMeasure.id)).scalars().all()
+    connection = db.session.connection()
+    for number in range(1, work_orders + 1):
+        wo_id = connection.execute(
+            insert(WorkOrder).values(number=f"BENCH-{number:05d}", title=f"Benchmark order {number}")
+        ).inserted_primary_key[0]
+        ms_id = connection.execute(
+            insert(MethodStatement).values(work_order_id=wo_id, title="Benchmark statement")
+        ).inserted_primary_key[0]
+        for sequence in range(1, tasks_per_order + 1):
+            task_id = connection.execute(
+                insert(Task).values(
+                    work_order_id=wo_id,
+                    method_statement_id=ms_id,
+                    sequence=sequence,
+                    activity=f"Step {sequence}",
+                )
+            ).inserted_primary_key[0]
+            for hazard_id in rng.sample(hazard_ids, min(2, len(hazard_ids))):
+                th_id = connection.execute(
+                    insert(TaskHazard).values(task_id=task_id, hazard_id=hazard_id)
+                ).inserted_primary_key[0]
+                for control_id in rng.sample(control_ids, min(2, len(control_ids))):
+                    connection.execute(
+                        insert(TaskControl).values(
+                            task_id=task_id,
+                            task_hazard_id=th_id,
+                            control_id=control_id,
+                            phase=ControlPhase.EXISTING,
+                        )
+                    )
+    db.session.commit()
+
+
+def set_indexes(enabled):
+    connection = db.session.connection()
+    for name in FOREIGN_KEY_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    if enabled:
+        for table in (MethodStatement.__table__, Task.__table__, TaskHazard.__table__, TaskControl.__table__):
+            for index in table.indexes:
+                if index.name in FOREIGN_KEY_INDEXES:
+                    index.create(connection)
+    connection.execute(text("ANALYZE"))
+    db.session.commit()
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+        db.session.rollback()
+        db.session.expunge_all()
+    return best * 1000
+
+
+def run_suite(repeat):
+    numbers = db.session.execute(select(WorkOrder.number).order_by(WorkOrder.id)).scalars().all()
+    target = numbers[len(numbers) // 2]
+    hazard_id = db.session.execute(select(TaskHazard.hazard_id).limit(1)).scalar()
+    control_id = db.session.execute(select(TaskControl.control_id).limit(1)).scalar()
+
+    def load_work_order():
+        services.load_work_order_tasks(services.get_work_order_by_number(target))
+
+    def hazard_usage():
+        db.session.execute(select(TaskHazard.task_id).where(TaskHazard.hazard_id == hazard_id)).all()
+
+    def control_usage():
+        db.session.execute(select(TaskControl.id).where(TaskControl.control_id == control_id)).all()
+
+    def delete_work_order():
+        db.session.delete(services.get_work_order_by_number(target))
+        db.session.flush()
+
+    return {
+        "load work order": timed(load_work_order, repeat),
+        "tasks using hazard": timed(hazard_usage, repeat),
+        "tasks using control": timed(control_usage, repeat),
+        "delete work order": timed(delete_work_order, repeat),
+    }
+
+
+def show_plans():
+    statements = {
+        "tasks by work order": "SELECT id FROM tasks WHERE work_order_id = 1 ORDER BY sequence, id",
+        "task_hazards by hazard": "SELECT task_id FROM task_hazards WHERE hazard_id = 1",
+        "task_controls by task": "SELECT id FROM task_controls WHERE task_id = 1",
+    }
+    for label, statement in statements.items():
+        plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+        print(f"    {label:<24} {'; '.join(row[-1] for row in plan)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--work-orders", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per work order")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchmarkConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'benchmark.sqlite'}"
+
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            db.create_all()
+            services.bootstrap_seed_data()
+            print(f"Populating {args.work_orders} work orders x {args.tasks} tasks...")
+            populate(args.work_orders, args.tasks)
+
+            results = {}
+            for label, enabled in (("without", False), ("with", True)):
+                set_indexes(enabled)
+                print(f"  {label} foreign-key indexes:")
+                show_plans()
+                results[label] = run_suite(args.repeat)
+
+            print(f"\n  {'operation':<22} {'without':>10} {'with':>10} {'speedup':>8}")
+            for operation, before in results["without"].items():
+                after = results["with"][operation]
+                print(f"  {operation:<22} {before:8.2f}ms {after:8.2f}ms {before / after:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -13,6 +13,7 @@ sys.path.insert(0, str(app_dir))
 
 from app import create_app
 from app.extensions import db
+from flask_migrate import upgrade
 
 def deploy_init():
     """Initialize application for deployment"""
@@ -26,6 +27,17 @@ def deploy_init():
             print("📊 Creating database tables...")
             db.create_all()
             
+            # Bring databases created before the migrations up to date
+            print("🗂️  Applying migrations...")
+            upgrade(directory=str(app_dir / 'migrations'))
+            
+            # Minify and fingerprint static assets, then precompress the results
+            print("🗜️  Building and precompressing static assets...")
+            from app.assets import build_assets
+            from app.compression import compress_static
+            build_assets(Path(app.static_folder))
+            compress_static(Path(app.static_folder))
+            
             # Initialize risk categories and sample data
             print("🎯 Seeding risk categories...")
             from app.risk import services
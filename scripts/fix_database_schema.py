@@ -10,6 +10,8 @@ from pathlib import Path
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
 
+from sqlalchemy import inspect
+
 from app import create_app
 from app.extensions import db
 
@@ -29,20 +31,11 @@ def fix_database_schema():
             db.create_all()
             
             # Verify tables were created
-            with db.engine.connect() as conn:
-                # Check risk_matrix_categories table
-                result = conn.execute(db.text("PRAGMA table_info(risk_matrix_categories)"))
-                columns = result.fetchall()
-                print("risk_matrix_categories table structure:")
-                for col in columns:
-                    print(f"  {col}")
-                
-                # Check personnel_at_risk table
-                result = conn.execute(db.text("PRAGMA table_info(personnel_at_risk)"))
-                columns = result.fetchall()
-                print("personnel_at_risk table structure:")
-                for col in columns:
-                    print(f"  {col}")
+            inspector = inspect(db.engine)
+            for table in ("risk_matrix_categories", "personnel_at_risk"):
+                print(f"{table} table structure:")
+                for col in inspector.get_columns(table):
+                    print(f"  {col['name']} {col['type']} nullable={col['nullable']}")
             
             print("Database schema fixed successfully!")
             print("Note: You will need to re-seed your data (hazards, controls, risk categories, personnel)")
@@ -10,6 +10,8 @@ from pathlib import Path
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
 
+from sqlalchemy import inspect
+
 from app import create_app
 from app.extensions import db
 
@@ -22,24 +24,23 @@ def fix_timestamp_constraints():
             # Check if the table exists and has the right structure
             with db.engine.connect() as conn:
                 # First, let's see the current table structure
-                result = conn.execute(db.text("PRAGMA table_info(task_controls)"))
-                columns = result.fetchall()
+                columns = inspect(conn).get_columns("task_controls")
                 print("Current task_controls table structure:")
                 for col in columns:
-                    print(f"  {col}")
+                    print(f"  {col['name']} {col['type']} nullable={col['nullable']}")
                 
                 # Check if created_at and updated_at have proper defaults
-                has_created_at = any(col[1] == 'created_at' for col in columns)
-                has_updated_at = any(col[1] == 'updated_at' for col in columns)
+                has_created_at = any(col['name'] == 'created_at' for col in columns)
+                has_updated_at = any(col['name'] == 'updated_at' for col in columns)
                 
                 if not has_created_at:
                     print("Adding created_at column...")
-                    conn.execute(db.text("ALTER TABLE task_controls ADD COLUMN created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL"))
+                    conn.execute(db.text("ALTER TABLE task_controls ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL"))
                     conn.commit()
                 
                 if not has_updated_at:
                     print("Adding updated_at column...")
-                    conn.execute(db.text("ALTER TABLE task_controls ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL"))
+                    conn.execute(db.text("ALTER TABLE task_controls ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL"))
                     conn.commit()
                 
                 # Update existing records to have timestamps if they don't
@@ -10,8 +10,11 @@ from pathlib import Path
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
 
+from sqlalchemy import insert
+
 from app import create_app
 from app.extensions import db
+from app.models import TaskControl
 
 def recreate_task_controls_table():
     """Recreate task_controls table with proper schema"""
@@ -30,38 +33,22 @@ def recreate_task_controls_table():
                 print("Recreating task_controls table...")
                 conn.execute(db.text("DROP TABLE IF EXISTS task_controls"))
                 
-                # Create table with proper timestamp defaults
-                conn.execute(db.text("""
-                    CREATE TABLE task_controls (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        task_id INTEGER NOT NULL,
-                        task_hazard_id INTEGER NOT NULL,
-                        control_id INTEGER NOT NULL,
-                        phase TEXT NOT NULL,
-                        notes TEXT,
-                        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                        FOREIGN KEY (task_hazard_id) REFERENCES task_hazards(id) ON DELETE CASCADE,
-                        FOREIGN KEY (control_id) REFERENCES control_measures(id) ON DELETE CASCADE,
-                        UNIQUE (task_hazard_id, control_id, phase)
-                    )
-                """))
+                # Create table from the model so the schema matches on every backend
+                TaskControl.__table__.create(conn)
                 
                 # Restore data with proper timestamps
                 if existing_data:
                     print("Restoring existing data...")
-                    for row in existing_data:
-                        # Convert row to list for easier handling
-                        row_data = list(row)
-                        # Ensure we have all 8 columns, pad with None if needed
-                        while len(row_data) < 8:
-                            row_data.append(None)
-                        
-                        conn.execute(db.text("""
-                            INSERT INTO task_controls (task_id, task_hazard_id, control_id, phase, notes)
-                            VALUES (?, ?, ?, ?, ?)
-                        """), (row_data[1], row_data[2], row_data[3], row_data[4], row_data[5]))
+                    conn.execute(insert(TaskControl.__table__), [
+                        {
+                            "task_id": row.task_id,
+                            "task_hazard_id": row.task_hazard_id,
+                            "control_id": row.control_id,
+                            "phase": row.phase,
+                            "notes": row._mapping.get("notes"),
+                        }
+                        for row in existing_data
+                    ])
                 
                 conn.commit()
                 print("Task controls table recreated successfully!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Hammer a SQLite database with concurrent reads and writes under each database profile.
+
+Mimics multi-worker, multi-threaded gunicorn: every process builds its own app and
+runs several threads that load a work order or edit one of its tasks and commit.
+
+Usage: python scripts/stress_sqlite.py [--processes 4] [--threads 4] [--ops 200] [--write-ratio 0.3]
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the app directory to Python path
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.config import Config
+from app.database import PROFILES
+from app.extensions import db
+from app.models import Task, WorkOrder
+from app.risk import services
+
+WORK_ORDER = "STRESS-001"
+TASKS = 200
+
+
+def make_config(database_path, profile):
+    class StressConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        DATABASE_PROFILE = profile
+
+    return StressConfig
+
+
+def prepare(database_path, profile):
+    app = create_app(make_config(database_path, profile))
+    with app.app_context():
+        db.create_all()
+        services.bootstrap_seed_data()
+        work_order = WorkOrder(number=WORK_ORDER, title="Concurrency stress")
+        db.session.add(work_order)
+        db.session.flush()
+        db.session.add_all(
+            Task(work_order_id=work_order.id, sequence=sequence, activity=f"Step {sequence}")
+            for sequence in range(1, TASKS + 1)
+        )
+        db.session.commit()
+        db.engine.dispose()
+
+
+def worker(database_path, profile, threads, ops, write_ratio, seed, results):
+    app = create_app(make_config(database_path, profile))
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        for _ in range(ops):
+            write = rng.random() < write_ratio
+            started = time.perf_counter()
+            try:
+                with app.app_context():
+                    work_order = services.get_work_order_by_number(WORK_ORDER)
+                    if write:
+                        task = Task.query.filter_by(work_order_id=work_order.id, sequence=rng.randint(1, TASKS)).first()
+                        task.activity = f"Edited {rng.random():.6f}"
+                        db.session.commit()
+                    else:
+                        services.load_work_order_tasks(work_order)
+            except OperationalError as exc:
+                with lock:
+                    failures.append(str(exc.orig))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    pool = [threading.Thread(target=run, args=(seed * 1000 + index,)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put((latencies, failures))
+
+
+def stress(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = Path(tmp) / "stress.sqlite"
+        prepare(database_path, profile)
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=worker,
+                args=(database_path, profile, args.threads, args.ops, args.write_ratio, index, results),
+            )
+            for index in range(args.processes)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for batch, _ in collected for latency in batch)
+    failures = [failure for _, batch in collected for failure in batch]
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+    print(
+        f"  {profile:<11} {len(latencies):>7} ok {len(failures):>6} failed "
+        f"{len(latencies) / elapsed:9.0f} ops/s  p50 {p50:7.1f}ms  p99 {p99:8.1f}ms"
+    )
+    for message in sorted(set(failures)):
+        print(f"      {failures.count(message)} x {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="operations per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--profile", choices=sorted(PROFILES), action="append", help="default: every profile")
+    args = parser.parse_args()
+
+    print(
+        f"{args.processes} processes x {args.threads} threads x {args.ops} ops "
+        f"({args.write_ratio:.0%} writes)"
+    )
+    for profile in args.profile or sorted(PROFILES):
+        stress(profile, args)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())